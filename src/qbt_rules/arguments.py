@@ -136,6 +136,13 @@ def create_parser() -> argparse.ArgumentParser:
         metavar="NUM"
     )
 
+    parser.add_argument(
+        '--server-threads',
+        type=int,
+        help='Request threads per Gunicorn worker (default: 8)',
+        metavar="NUM"
+    )
+
     # Client configuration (for client mode)
     parser.add_argument(
         '--client-server-url',
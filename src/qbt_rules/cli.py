@@ -60,6 +60,13 @@ def get_server_config(args, config_obj) -> dict:
             config_obj.config,
             'server.workers',
             default=1
+        )),
+        'threads': parse_int(resolve_config(
+            getattr(args, 'server_threads', None),
+            ENV_VAR_MAP.get('server.threads', 'QBT_RULES_SERVER_THREADS'),
+            config_obj.config,
+            'server.threads',
+            default=8
         ))
     }
 
@@ -192,6 +199,7 @@ def run_server_mode(args, config_obj):
             host=server_config['host'],
             port=server_config['port'],
             workers=server_config['workers'],
+            threads=server_config['threads'],
             log_http_access=log_http_access
         )
     except KeyboardInterrupt:
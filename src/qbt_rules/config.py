@@ -30,12 +30,14 @@ ENV_VAR_MAP = {
     'server.port': 'QBT_RULES_SERVER_PORT',
     'server.api_key': 'QBT_RULES_SERVER_API_KEY',
     'server.workers': 'QBT_RULES_SERVER_WORKERS',
+    'server.threads': 'QBT_RULES_SERVER_THREADS',
 
     # Queue configuration
     'queue.backend': 'QBT_RULES_QUEUE_BACKEND',
     'queue.sqlite_path': 'QBT_RULES_QUEUE_SQLITE_PATH',
     'queue.redis_url': 'QBT_RULES_QUEUE_REDIS_URL',
     'queue.cleanup_after': 'QBT_RULES_QUEUE_CLEANUP_AFTER',
+    'queue.store_tracebacks': 'QBT_RULES_QUEUE_STORE_TRACEBACKS',
 
     # Client configuration
     'client.server_url': 'QBT_RULES_CLIENT_SERVER_URL',
@@ -64,6 +66,9 @@ ENV_VAR_MAP = {
 # Default config location (Linux FHS standard)
 DEFAULT_CONFIG_SHARE_PATH = Path('/usr/share/qbt-rules')
 
+# libyaml-backed safe loader when PyYAML was built with it, pure Python otherwise
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def copy_default_if_missing(target_path: Path, default_filename: str) -> bool:
     """
@@ -357,6 +362,30 @@ def expand_env_vars(value: Any) -> Any:
         return value
 
 
+def uses_refs(node: Any) -> bool:
+    """
+    Check whether a rules structure contains any $ref or ${...} placeholder
+
+    Args:
+        node: Parsed rules (dict, list or scalar)
+
+    Returns:
+        True if anything in the structure would need resolving
+    """
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if '$ref' in item:
+                return True
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, str) and '${' in item:
+            return True
+    return False
+
+
 def load_yaml_file(file_path: Path) -> Dict[str, Any]:
     """
     Load YAML file with error handling
@@ -378,7 +407,7 @@ def load_yaml_file(file_path: Path) -> Dict[str, Any]:
             )
 
         with open(file_path, 'r') as f:
-            content = yaml.safe_load(f)
+            content = yaml.load(f, Loader=YAML_LOADER)
 
         if content is None:
             raise ConfigurationError(
@@ -492,9 +521,12 @@ class Config:
         refs = raw_rules.get('refs', {})
         instances = raw_rules.get('instances', {})
 
-        # Create resolver with global refs
+        # Create resolver with global refs - plain rules skip resolution entirely
         # TODO: Support per-instance resolvers when running against specific instances
-        self._resolver = RuleResolver(refs=refs, instance_id=None, instances=instances)
+        if refs or instances or uses_refs(self.rules):
+            self._resolver = RuleResolver(refs=refs, instance_id=None, instances=instances)
+        else:
+            self._resolver = None
 
         # Invalidate resolved rules cache
         self._resolved_rules_cache = None
@@ -552,6 +584,16 @@ class Config:
 
         return bool(config_value)
 
+    def store_tracebacks(self) -> bool:
+        """Check if failed jobs should store the full traceback (default: error summary only)"""
+        config_value = self.get('queue.store_tracebacks', False)
+
+        # Handle string values from YAML / env
+        if isinstance(config_value, str):
+            return config_value.lower() in ('true', '1', 'yes', 'on')
+
+        return bool(config_value)
+
     def get_log_level(self) -> str:
         """Get logging level"""
         return os.environ.get('LOG_LEVEL', self.get('logging.level', 'INFO')).upper()
@@ -4,7 +4,9 @@ Core logic for evaluating conditions and executing actions
 """
 
 import re
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 
 from qbt_rules.api import QBittorrentAPI
@@ -14,6 +16,15 @@ from qbt_rules.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Rule prepared for evaluation: (name, conditions, actions, context, stop_on_match)
+CompiledRule = Tuple[str, Dict, List[Dict], Any, bool]
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> 're.Pattern[str]':
+    """Compile a 'matches' regex once per distinct pattern"""
+    return re.compile(pattern)
+
 
 @dataclass
 class RuleStats:
@@ -49,6 +60,10 @@ class ConditionEvaluator:
         self.transfer_info: Optional[Dict] = None
         self.app_preferences: Optional[Dict] = None
 
+        # Reference time for older_than/newer_than - sampled once per rule pass
+        # (None = read the clock on every comparison)
+        self.now: Optional[float] = None
+
     def clear_caches(self):
         """Clear all caches (call between rule executions)"""
         self.trackers_cache.clear()
@@ -58,6 +73,7 @@ class ConditionEvaluator:
         self.webseeds_cache.clear()
         self.transfer_info = None
         self.app_preferences = None
+        self.now = None
 
     def evaluate(self, torrent: Dict, conditions: Dict, current_context: Optional[str] = None, required_context: Optional[Any] = None) -> bool:
         """
@@ -299,7 +315,7 @@ class ConditionEvaluator:
         elif operator == 'not_contains':
             return expected not in str(actual)
         elif operator == 'matches':
-            return re.search(str(expected), str(actual)) is not None
+            return _compile_pattern(str(expected)).search(str(actual)) is not None
 
         # List operators
         elif operator == 'in':
@@ -337,9 +353,9 @@ class ConditionEvaluator:
 
         # Time operators
         elif operator == 'older_than':
-            return is_older_than(int(actual), str(expected))
+            return is_older_than(int(actual), str(expected), self.now)
         elif operator == 'newer_than':
-            return is_newer_than(int(actual), str(expected))
+            return is_newer_than(int(actual), str(expected), self.now)
 
         else:
             raise OperatorError(operator, field)
@@ -531,6 +547,66 @@ class RulesEngine:
         self.executor = ActionExecutor(api, dry_run)
         self.stats = RuleStats()
 
+        # Prepared rules, rebuilt only when config hands back a different rules list
+        self._compiled_source: Optional[list] = None
+        self._compiled: List[CompiledRule] = []
+
+    def _compile_rules(self, rules: list) -> List[CompiledRule]:
+        """
+        Prepare rules for evaluation
+
+        Drops disabled rules and unpacks each rule's fields once, so run()
+        does no per-torrent dict lookups or defaulting on the rule itself.
+
+        Args:
+            rules: Resolved rules from config (file order)
+
+        Returns:
+            Enabled rules as CompiledRule tuples, in file order
+        """
+        compiled = []
+        for rule in rules:
+            name = rule.get('name', 'unnamed')
+            if not rule.get('enabled', True):
+                logger.debug(f"Skipping disabled rule: {name}")
+                continue
+            compiled.append((
+                name,
+                rule.get('conditions', {}),
+                rule.get('actions', []),
+                rule.get('context'),
+                rule.get('stop_on_match', False)
+            ))
+        return compiled
+
+    def _get_compiled_rules(self, rules: list) -> List[CompiledRule]:
+        """
+        Get prepared rules, recompiling only when the rules list changed
+
+        Config returns the same list object until rules.yml is reloaded, so
+        identity is enough to detect a reload.
+
+        Args:
+            rules: Resolved rules from config
+
+        Returns:
+            Prepared rules for this rules list
+        """
+        if rules is not self._compiled_source:
+            self._compiled = self._compile_rules(rules)
+            self._compiled_source = rules
+        return self._compiled
+
+    def reset_stats(self):
+        """Zero execution statistics in place so the engine can be reused across runs"""
+        for field in fields(self.stats):
+            setattr(self.stats, field.name, field.default)
+
+    def set_dry_run(self, dry_run: bool):
+        """Switch dry-run mode for later runs (engine and action executor alike)"""
+        self.dry_run = dry_run
+        self.executor.dry_run = dry_run
+
     def run(self, context: Optional[str] = None, torrent_hash: Optional[str] = None):
         """
         Execute rules engine
@@ -563,16 +639,20 @@ class RulesEngine:
             # Get rules (execute in YAML file order)
             rules = self.config.get_rules()
             logger.info(f"Loaded {len(rules)} rules (execute in file order)")
+            compiled_rules = self._get_compiled_rules(rules)
+
+            # Per-torrent API caches must not leak between runs of a reused engine
+            self.evaluator.clear_caches()
+
+            # One clock sample for the whole pass - age comparisons don't need
+            # per-torrent freshness
+            self.evaluator.now = time.time()
 
             # Process each rule
             processed_torrents = set()
 
-            for rule in rules:
-                if not rule.get('enabled', True):
-                    logger.debug(f"Skipping disabled rule: {rule.get('name', 'unnamed')}")
-                    continue
-
-                logger.info(f"Processing rule: {rule.get('name', 'unnamed')}")
+            for name, conditions, actions, rule_context, stop_on_match in compiled_rules:
+                logger.info(f"Processing rule: {name}")
 
                 matched_count = 0
                 for torrent in torrents:
@@ -586,14 +666,14 @@ class RulesEngine:
 
                     # Evaluate conditions
                     # Pass runtime context and rule's context requirement separately
-                    if self.evaluator.evaluate(torrent, rule.get('conditions', {}), context, rule.get('context')):
+                    if self.evaluator.evaluate(torrent, conditions, context, rule_context):
                         matched_count += 1
                         self.stats.rules_matched += 1
 
-                        logger.debug(f"Rule '{rule.get('name', 'unnamed')}' matched: {torrent.get('name', 'unknown')}")
+                        logger.debug(f"Rule '{name}' matched: {torrent.get('name', 'unknown')}")
 
                         # Execute actions
-                        for action in rule.get('actions', []):
+                        for action in actions:
                             success, skipped = self.executor.execute(torrent, action)
                             if success:
                                 if skipped:
@@ -619,11 +699,11 @@ class RulesEngine:
                                 self.stats.errors += 1
 
                         # Mark as processed if stop_on_match
-                        if rule.get('stop_on_match', False):
+                        if stop_on_match:
                             processed_torrents.add(torrent['hash'])
 
                 if matched_count > 0:
-                    logger.info(f"  Rule '{rule.get('name', 'unnamed')}' matched {matched_count} torrent(s)")
+                    logger.info(f"  Rule '{name}' matched {matched_count} torrent(s)")
 
             self.stats.processed = len(processed_torrents)
 
@@ -632,6 +712,8 @@ class RulesEngine:
             raise
 
         finally:
+            # Evaluations outside a run go back to reading the live clock
+            self.evaluator.now = None
             self._print_summary()
 
     def _print_summary(self):
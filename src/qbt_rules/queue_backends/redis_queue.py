@@ -8,10 +8,9 @@ In-memory queue implementation using Redis with:
 - Optional persistence (depends on Redis configuration)
 """
 
-import json
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, cast
 from datetime import datetime, timedelta, timezone
 
 try:
@@ -22,7 +21,9 @@ except ImportError:
         "Install with: pip install qbt-rules[redis]"
     )
 
-from qbt_rules.queue_manager import QueueManager, JobStatus
+from qbt_rules.queue_manager import (
+    QueueManager, JobStatus, JobSignal, SNAPSHOT_STATUSES, dump_json, load_json
+)
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +48,9 @@ class RedisQueue(QueueManager):
 
     KEY_PREFIX = "qbt_rules"
 
+    # cleanup_old_jobs() inspects and deletes at most this many jobs per pipeline
+    CLEANUP_BATCH_SIZE = 1000
+
     def __init__(self, redis_url: str = 'redis://localhost:6379/0'):
         """
         Initialize Redis queue
@@ -56,6 +60,7 @@ class RedisQueue(QueueManager):
                       Format: redis://[:password@]host[:port][/database]
         """
         self.redis_url = redis_url
+        self._job_signal = JobSignal()  # Wakes dequeue_blocking() on enqueue
 
         # Initialize Redis connection pool
         try:
@@ -122,6 +127,7 @@ class RedisQueue(QueueManager):
 
         pipeline.execute()
 
+        self._job_signal.notify()
         logger.debug(f"Enqueued job {job_id} (context={context}, hash={hash_filter})")
         return job_id
 
@@ -256,7 +262,7 @@ class RedisQueue(QueueManager):
             pipeline.hset(job_key, 'completed_at', completed_at.isoformat())
 
         if result is not None:
-            pipeline.hset(job_key, 'result', json.dumps(result))
+            pipeline.hset(job_key, 'result', dump_json(result))
 
         if error is not None:
             pipeline.hset(job_key, 'error', error)
@@ -302,12 +308,12 @@ class RedisQueue(QueueManager):
         cutoff_date = datetime.now(timezone.utc) - timedelta(seconds=retention_period)
         cutoff_timestamp = cutoff_date.timestamp()
 
-        # Get old job IDs from time-sorted set
-        old_job_ids = self.redis.zrangebyscore(
+        # Get old job IDs from time-sorted set (str - the pool decodes responses)
+        old_job_ids = cast(List[str], self.redis.zrangebyscore(
             self._key('jobs', 'by_time'),
             '-inf',
             cutoff_timestamp
-        )
+        ))
 
         if not old_job_ids:
             return 0
@@ -315,27 +321,38 @@ class RedisQueue(QueueManager):
         deleted = 0
         cleanup_statuses = [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]
 
-        for job_id in old_job_ids:
-            job = self.get_job(job_id)
+        for start in range(0, len(old_job_ids), self.CLEANUP_BATCH_SIZE):
+            batch = old_job_ids[start:start + self.CLEANUP_BATCH_SIZE]
 
-            if not job or job['status'] not in cleanup_statuses:
-                continue
+            # Fetch status/context for the whole batch in one round-trip
+            pipeline = self.redis.pipeline()
+            for job_id in batch:
+                pipeline.hmget(self._key('jobs', job_id), 'status', 'context')
+            fields = pipeline.execute()
 
-            # Delete job
+            # Delete eligible jobs and their index entries in one round-trip
             pipeline = self.redis.pipeline()
+            batch_deleted = 0
+
+            for job_id, (status, context) in zip(batch, fields):
+                if status not in cleanup_statuses:
+                    continue
 
-            # Remove job data
-            pipeline.delete(self._key('jobs', job_id))
+                # Remove job data
+                pipeline.delete(self._key('jobs', job_id))
 
-            # Remove from indexes
-            pipeline.zrem(self._key('jobs', 'by_time'), job_id)
-            pipeline.srem(self._key('jobs', 'status', job['status']), job_id)
+                # Remove from indexes
+                pipeline.zrem(self._key('jobs', 'by_time'), job_id)
+                pipeline.srem(self._key('jobs', 'status', status), job_id)
 
-            if job.get('context'):
-                pipeline.srem(self._key('jobs', 'context', job['context']), job_id)
+                if context:
+                    pipeline.srem(self._key('jobs', 'context', context), job_id)
 
-            pipeline.execute()
-            deleted += 1
+                batch_deleted += 1
+
+            if batch_deleted:
+                pipeline.execute()
+                deleted += batch_deleted
 
         if deleted > 0:
             logger.info(f"Cleaned up {deleted} old jobs older than {cutoff_date}")
@@ -346,15 +363,33 @@ class RedisQueue(QueueManager):
         """Get number of pending jobs"""
         return self.redis.llen(self._key('queue', 'pending'))
 
+    def _read_counts(self) -> tuple:
+        """
+        Read per-status counts and the total in one pipeline
+
+        Returns:
+            Tuple of (counts by status, total jobs)
+        """
+        pipeline = self.redis.pipeline()
+        for status in JobStatus.all():
+            pipeline.scard(self._key('jobs', 'status', status))
+        pipeline.zcard(self._key('jobs', 'by_time'))
+        results = pipeline.execute()
+
+        counts = dict(zip(JobStatus.all(), results))
+        return counts, results[-1]
+
     def get_stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
+        # Count by status (one pipelined round trip)
+        counts, total = self._read_counts()
         stats = {
-            'total_jobs': self.count_jobs(),
-            'pending': self.count_jobs(JobStatus.PENDING),
-            'processing': self.count_jobs(JobStatus.PROCESSING),
-            'completed': self.count_jobs(JobStatus.COMPLETED),
-            'failed': self.count_jobs(JobStatus.FAILED),
-            'cancelled': self.count_jobs(JobStatus.CANCELLED),
+            'total_jobs': total,
+            'pending': counts[JobStatus.PENDING],
+            'processing': counts[JobStatus.PROCESSING],
+            'completed': counts[JobStatus.COMPLETED],
+            'failed': counts[JobStatus.FAILED],
+            'cancelled': counts[JobStatus.CANCELLED],
         }
 
         # Average execution time for completed jobs
@@ -388,6 +423,20 @@ class RedisQueue(QueueManager):
             logger.error(f"Queue health check failed: {e}")
             return False
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Get health, depth and active job counts from one pipelined round trip"""
+        try:
+            pipeline = self.redis.pipeline()
+            for status in SNAPSHOT_STATUSES:
+                pipeline.scard(self._key('jobs', 'status', status))
+            pipeline.llen(self._key('queue', 'pending'))
+            results = pipeline.execute()
+        except Exception as e:
+            logger.error(f"Queue health check failed: {e}")
+            return {'healthy': False, 'depth': 0, 'counts': dict.fromkeys(SNAPSHOT_STATUSES, 0)}
+
+        return {'healthy': True, 'depth': results[-1], 'counts': dict(zip(SNAPSHOT_STATUSES, results))}
+
     def _hash_to_dict(self, hash_data: Dict[str, str]) -> Dict[str, Any]:
         """
         Convert Redis hash to job dictionary
@@ -406,7 +455,7 @@ class RedisQueue(QueueManager):
             'created_at': hash_data.get('created_at', ''),
             'started_at': hash_data.get('started_at') or None,
             'completed_at': hash_data.get('completed_at') or None,
-            'result': json.loads(hash_data['result']) if hash_data.get('result') else None,
+            'result': load_json(hash_data['result']) if hash_data.get('result') else None,
             'error': hash_data.get('error') or None
         }
 
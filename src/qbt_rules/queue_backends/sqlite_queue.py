@@ -9,7 +9,6 @@ File-based queue implementation using SQLite with:
 """
 
 import sqlite3
-import json
 import logging
 import threading
 from pathlib import Path
@@ -17,10 +16,19 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta, timezone
 from contextlib import contextmanager
 
-from qbt_rules.queue_manager import QueueManager, JobStatus
+from qbt_rules.queue_manager import (
+    QueueManager, JobStatus, JobSignal, SNAPSHOT_STATUSES, dump_json, load_json
+)
 
 logger = logging.getLogger(__name__)
 
+# snapshot() counts - the IN list lets SQLite answer from idx_jobs_status
+# without scanning the finished jobs
+SNAPSHOT_QUERY = (
+    'SELECT status, COUNT(*) FROM jobs WHERE status IN ({}) GROUP BY status'
+    .format(', '.join('?' * len(SNAPSHOT_STATUSES)))
+)
+
 
 class SQLiteQueue(QueueManager):
     """
@@ -35,6 +43,11 @@ class SQLiteQueue(QueueManager):
 
     SCHEMA_VERSION = 1
 
+    # cleanup_old_jobs() deletes at most this many rows per transaction
+    CLEANUP_BATCH_SIZE = 1000
+    # Run a passive WAL checkpoint after this many full cleanup batches
+    CLEANUP_CHECKPOINT_EVERY = 10
+
     def __init__(self, db_path: str = '/config/qbt-rules.db'):
         """
         Initialize SQLite queue
@@ -46,6 +59,7 @@ class SQLiteQueue(QueueManager):
         self.local = threading.local()
         self._connections = []  # Track all connections
         self._conn_lock = threading.Lock()  # Lock for connection tracking
+        self._job_signal = JobSignal()  # Wakes dequeue_blocking() on enqueue
 
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -71,6 +85,10 @@ class SQLiteQueue(QueueManager):
             conn.row_factory = sqlite3.Row
             # Enable WAL mode for better concurrency
             conn.execute('PRAGMA journal_mode=WAL')
+            # WAL keeps the database consistent with NORMAL; only the checkpoint fsyncs
+            conn.execute('PRAGMA synchronous=NORMAL')
+            # Sorts for job listings build their temp b-trees in memory
+            conn.execute('PRAGMA temp_store=MEMORY')
             # Enable foreign keys
             conn.execute('PRAGMA foreign_keys=ON')
 
@@ -195,6 +213,7 @@ class SQLiteQueue(QueueManager):
                 VALUES (?, 0)
             ''', (job_id,))
 
+        self._job_signal.notify()
         logger.debug(f"Enqueued job {job_id} (context={context}, hash={hash_filter})")
         return job_id
 
@@ -318,7 +337,7 @@ class SQLiteQueue(QueueManager):
 
         if result is not None:
             updates.append('result = ?')
-            params.append(json.dumps(result))
+            params.append(dump_json(result))
 
         if error is not None:
             updates.append('error = ?')
@@ -351,17 +370,41 @@ class SQLiteQueue(QueueManager):
         return True
 
     def cleanup_old_jobs(self, retention_period: int) -> int:
-        """Remove old completed/failed/cancelled jobs"""
+        """
+        Remove old completed/failed/cancelled jobs
+
+        Deletes in batches of CLEANUP_BATCH_SIZE rows, each committed on its
+        own, so a large backlog never builds one huge WAL commit.
+        """
         cutoff_date = datetime.now(timezone.utc) - timedelta(seconds=retention_period)
 
         conn = self._get_connection()
-        cursor = conn.execute('''
-            DELETE FROM jobs
-            WHERE status IN (?, ?, ?)
-            AND completed_at < ?
-        ''', (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED, cutoff_date.isoformat()))
+        deleted = 0
+        batches = 0
+
+        while True:
+            cursor = conn.execute('''
+                DELETE FROM jobs
+                WHERE id IN (
+                    SELECT id FROM jobs
+                    WHERE status IN (?, ?, ?)
+                    AND completed_at < ?
+                    LIMIT ?
+                )
+            ''', (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED,
+                  cutoff_date.isoformat(), self.CLEANUP_BATCH_SIZE))
+
+            batch_deleted = cursor.rowcount
+            deleted += batch_deleted
+
+            if batch_deleted < self.CLEANUP_BATCH_SIZE:
+                break
+
+            # Keep the WAL from growing across many back-to-back batches
+            batches += 1
+            if batches % self.CLEANUP_CHECKPOINT_EVERY == 0:
+                conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
 
-        deleted = cursor.rowcount
         if deleted > 0:
             logger.info(f"Cleaned up {deleted} old jobs older than {cutoff_date}")
 
@@ -371,18 +414,27 @@ class SQLiteQueue(QueueManager):
         """Get number of pending jobs"""
         return self.count_jobs(JobStatus.PENDING)
 
+    def _status_counts(self) -> Dict[str, int]:
+        """Count jobs for every status with a single GROUP BY query"""
+        conn = self._get_connection()
+        counts = dict.fromkeys(JobStatus.all(), 0)
+        for status, count in conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'):
+            counts[status] = count
+        return counts
+
     def get_stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
         conn = self._get_connection()
 
-        # Count by status
+        # Count by status (one query)
+        counts = self._status_counts()
         stats = {
-            'total_jobs': self.count_jobs(),
-            'pending': self.count_jobs(JobStatus.PENDING),
-            'processing': self.count_jobs(JobStatus.PROCESSING),
-            'completed': self.count_jobs(JobStatus.COMPLETED),
-            'failed': self.count_jobs(JobStatus.FAILED),
-            'cancelled': self.count_jobs(JobStatus.CANCELLED),
+            'total_jobs': sum(counts.values()),
+            'pending': counts[JobStatus.PENDING],
+            'processing': counts[JobStatus.PROCESSING],
+            'completed': counts[JobStatus.COMPLETED],
+            'failed': counts[JobStatus.FAILED],
+            'cancelled': counts[JobStatus.CANCELLED],
         }
 
         # Average execution time for completed jobs
@@ -409,6 +461,19 @@ class SQLiteQueue(QueueManager):
             logger.error(f"Queue health check failed: {e}")
             return False
 
+    def snapshot(self) -> Dict[str, Any]:
+        """Get health, depth and active job counts from one indexed query"""
+        counts = dict.fromkeys(SNAPSHOT_STATUSES, 0)
+        try:
+            conn = self._get_connection()
+            for status, count in conn.execute(SNAPSHOT_QUERY, SNAPSHOT_STATUSES):
+                counts[status] = count
+        except Exception as e:
+            logger.error(f"Queue health check failed: {e}")
+            return {'healthy': False, 'depth': 0, 'counts': dict.fromkeys(SNAPSHOT_STATUSES, 0)}
+
+        return {'healthy': True, 'depth': counts[JobStatus.PENDING], 'counts': counts}
+
     def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
         """
         Convert SQLite row to job dictionary
@@ -427,7 +492,7 @@ class SQLiteQueue(QueueManager):
             'created_at': datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
             'started_at': datetime.fromisoformat(row['started_at']) if row['started_at'] else None,
             'completed_at': datetime.fromisoformat(row['completed_at']) if row['completed_at'] else None,
-            'result': json.loads(row['result']) if row['result'] else None,
+            'result': load_json(row['result']) if row['result'] else None,
             'error': row['error']
         }
 
@@ -1,15 +1,22 @@
 """
-Queue Manager - Abstract interface for job queue backends
+Queue Manager - Structural interface for job queue backends
 
 Supports multiple backend implementations (SQLite, Redis) with consistent API.
 All jobs flow through the queue for sequential execution.
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+import json
+import threading
+from typing import Dict, List, Optional, Any, Protocol, runtime_checkable
 from datetime import datetime, timezone
 import uuid
 
+# orjson is optional - used for the job result serialization boundary when installed
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None  # type: ignore[assignment]
+
 
 class JobStatus:
     """Job status constants"""
@@ -22,12 +29,86 @@ class JobStatus:
     @classmethod
     def all(cls) -> List[str]:
         """Get all valid status values"""
-        return [cls.PENDING, cls.PROCESSING, cls.COMPLETED, cls.FAILED, cls.CANCELLED]
+        return list(_ALL_STATUSES)
+
+
+# Canonical status order and O(1) membership set, built once at import
+_ALL_STATUSES = (
+    JobStatus.PENDING,
+    JobStatus.PROCESSING,
+    JobStatus.COMPLETED,
+    JobStatus.FAILED,
+    JobStatus.CANCELLED,
+)
+_VALID_STATUSES = frozenset(_ALL_STATUSES)
+
+# Statuses counted by snapshot() - the ones health checks look at
+SNAPSHOT_STATUSES = (JobStatus.PENDING, JobStatus.PROCESSING)
+
+
+class JobSignal:
+    """
+    Wakes threads blocked in dequeue_blocking() when work may be available
+
+    The pending flag is latched so a notify() that lands between a failed
+    dequeue and the wait is not lost; the next wait returns immediately.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending = False
+
+    def notify(self) -> None:
+        """Signal that a job was enqueued (or that waiters should re-check)"""
+        with self._condition:
+            self._pending = True
+            self._condition.notify_all()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until notified or until timeout elapses
+
+        Args:
+            timeout: Maximum seconds to wait
 
+        Returns:
+            True if a notification was received, False on timeout
+        """
+        with self._condition:
+            if not self._pending:
+                self._condition.wait(timeout)
+            signalled = self._pending
+            self._pending = False
+            return signalled
+
+
+# Guards lazy JobSignal creation for backends that do not build one in __init__
+_JOB_SIGNAL_LOCK = threading.Lock()
 
-class QueueManager(ABC):
+
+def _job_signal_for(queue: 'QueueManager') -> JobSignal:
+    """Return the queue's JobSignal, creating it on first use if the backend did not"""
+    signal = getattr(queue, '_job_signal', None)
+    if signal is None:
+        with _JOB_SIGNAL_LOCK:
+            signal = getattr(queue, '_job_signal', None)
+            if signal is None:
+                signal = queue._job_signal = JobSignal()
+    return signal
+
+
+@runtime_checkable
+class QueueManager(Protocol):
     """
-    Abstract base class for job queue backends
+    Protocol for job queue backends
+
+    Backends subclass it explicitly to inherit the shared helpers
+    (generate_job_id, validate_status, create_job_dict); there is no ABC
+    metaclass, so instantiation and method calls carry no abstract checks.
+    Backends also own a ``_job_signal`` (JobSignal) that enqueue() notifies,
+    which backs the inherited dequeue_blocking() and wake(). One is created
+    on first use if the backend does not set it in __init__; such a backend
+    is then only woken by wake() or the timeout.
 
     Implementations must provide:
     - Persistent job storage
@@ -37,7 +118,8 @@ class QueueManager(ABC):
     - Cleanup of old jobs
     """
 
-    @abstractmethod
+    _job_signal: JobSignal
+
     def enqueue(self, context: Optional[str] = None, hash_filter: Optional[str] = None) -> str:
         """
         Add job to queue
@@ -49,9 +131,8 @@ class QueueManager(ABC):
         Returns:
             Job ID (UUID string)
         """
-        pass
+        ...
 
-    @abstractmethod
     def dequeue(self) -> Optional[Dict[str, Any]]:
         """
         Get next pending job from queue
@@ -62,9 +143,32 @@ class QueueManager(ABC):
         Returns:
             Job dictionary with all fields, or None if queue empty
         """
-        pass
+        ...
+
+    def dequeue_blocking(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Get next pending job, waiting up to timeout for one to arrive
+
+        Wakes as soon as enqueue() or wake() signals this queue instance.
+        The queue is only re-read after a signal, so an idle cycle costs a
+        single dequeue(); jobs enqueued by another process are picked up by
+        the next call once the timeout elapses.
+
+        Args:
+            timeout: Maximum seconds to wait when the queue is empty
+
+        Returns:
+            Job dictionary with all fields, or None if still empty
+        """
+        job = self.dequeue()
+        if job is None and _job_signal_for(self).wait(timeout):
+            job = self.dequeue()
+        return job
+
+    def wake(self) -> None:
+        """Release any thread blocked in dequeue_blocking() (e.g. on shutdown)"""
+        _job_signal_for(self).notify()
 
-    @abstractmethod
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Get job by ID
@@ -75,9 +179,8 @@ class QueueManager(ABC):
         Returns:
             Job dictionary with all fields, or None if not found
         """
-        pass
+        ...
 
-    @abstractmethod
     def list_jobs(
         self,
         status: Optional[str] = None,
@@ -97,9 +200,8 @@ class QueueManager(ABC):
         Returns:
             List of job dictionaries ordered by created_at DESC
         """
-        pass
+        ...
 
-    @abstractmethod
     def count_jobs(self, status: Optional[str] = None) -> int:
         """
         Count jobs by status
@@ -110,9 +212,8 @@ class QueueManager(ABC):
         Returns:
             Number of jobs matching filter
         """
-        pass
+        ...
 
-    @abstractmethod
     def update_status(
         self,
         job_id: str,
@@ -136,9 +237,8 @@ class QueueManager(ABC):
         Returns:
             True if updated, False if job not found
         """
-        pass
+        ...
 
-    @abstractmethod
     def cancel_job(self, job_id: str) -> bool:
         """
         Cancel pending job
@@ -151,22 +251,24 @@ class QueueManager(ABC):
         Returns:
             True if cancelled, False if job not found or not cancellable
         """
-        pass
+        ...
 
-    @abstractmethod
     def cleanup_old_jobs(self, retention_period: int) -> int:
         """
         Remove old completed/failed/cancelled jobs
 
+        Implementations must delete in bounded batches (e.g. 1000 jobs per
+        write) rather than one unbounded delete, so a large backlog never
+        stalls the backend with a single huge write transaction.
+
         Args:
             retention_period: Keep jobs newer than this many seconds
 
         Returns:
             Number of jobs deleted
         """
-        pass
+        ...
 
-    @abstractmethod
     def get_queue_depth(self) -> int:
         """
         Get number of pending jobs in queue
@@ -174,9 +276,8 @@ class QueueManager(ABC):
         Returns:
             Count of jobs with status=pending
         """
-        pass
+        ...
 
-    @abstractmethod
     def get_stats(self) -> Dict[str, Any]:
         """
         Get queue statistics
@@ -191,9 +292,8 @@ class QueueManager(ABC):
             - cancelled: Cancelled jobs
             - average_execution_time: Average time in seconds (completed jobs only)
         """
-        pass
+        ...
 
-    @abstractmethod
     def health_check(self) -> bool:
         """
         Check if queue backend is healthy and accessible
@@ -201,7 +301,30 @@ class QueueManager(ABC):
         Returns:
             True if healthy, False otherwise
         """
-        pass
+        ...
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get health, queue depth and active job counts together
+
+        Backends override this to answer in a single round trip; this default
+        composes the individual calls. Only SNAPSHOT_STATUSES are counted, so
+        health probes never have to count the (ever growing) finished jobs.
+
+        Returns:
+            Dictionary with:
+            - healthy: Result of the backend health check
+            - depth: Pending jobs waiting in the queue
+            - counts: Job count per SNAPSHOT_STATUSES entry (all zero when unhealthy)
+        """
+        if not self.health_check():
+            return {'healthy': False, 'depth': 0, 'counts': dict.fromkeys(SNAPSHOT_STATUSES, 0)}
+
+        return {
+            'healthy': True,
+            'depth': self.get_queue_depth(),
+            'counts': {status: self.count_jobs(status) for status in SNAPSHOT_STATUSES}
+        }
 
     @staticmethod
     def generate_job_id() -> str:
@@ -211,7 +334,7 @@ class QueueManager(ABC):
     @staticmethod
     def validate_status(status: str) -> bool:
         """Validate status value"""
-        return status in JobStatus.all()
+        return status in _VALID_STATUSES
 
     def create_job_dict(
         self,
@@ -247,6 +370,38 @@ class QueueManager(ABC):
         }
 
 
+def dump_json(value: Any) -> str:
+    """
+    Serialize a job field (e.g. result) to a JSON string for storage
+
+    Uses orjson when available, falling back to the standard library.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value)
+
+
+def load_json(text: Any) -> Any:
+    """
+    Deserialize a stored job field produced by dump_json()
+
+    Args:
+        text: JSON text (str or bytes)
+
+    Returns:
+        Parsed value
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 def create_queue(backend: str = 'sqlite', **kwargs) -> QueueManager:
     """
     Factory function to create queue backend
@@ -9,9 +9,8 @@ Implements the resolver layer that provides:
 - Circular dependency detection
 """
 
-import copy
 import re
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from qbt_rules.errors import (
     CircularRefError,
@@ -28,14 +27,36 @@ logger = get_logger(__name__)
 # Pattern for variable substitution: ${vars.name}
 VAR_PATTERN = re.compile(r'\$\{(vars\.\w+)\}')
 
+# A string that is exactly one ${...} placeholder (no other '${' inside). The
+# path is captured loosely so malformed paths still reach _resolve_var and raise.
+WHOLE_VAR_PATTERN = re.compile(r'\A\$\{((?:(?!\$\{).)*)\}\Z', re.DOTALL)
+
+
+# Sentinel for ref table misses (None is a valid, if odd, template)
+_MISSING = object()
+
+# _resolve() work item: (container, slot, node, path) - the expanded node is
+# written to container[slot], a list index or a dict key
+_Frame = Tuple[Union[List[Any], Dict[Any, Any]], Any, Any, str]
+
+
+class _RefDone:
+    """Worklist marker: a ref's expansion is finished - cache it and leave the ref"""
+
+    __slots__ = ('key',)
+
+    def __init__(self, key: Tuple[str, Optional[Tuple[str, ...]]]):
+        self.key = key
+
 
 class RuleResolver:
     """
     Resolves references and variables in rules configuration
 
-    Two-phase resolution:
-    1. Reference expansion ($ref: path) - recursive structural replacement
-    2. Variable substitution (${vars.name}) - type-aware value replacement
+    Single-pass resolution - one walk over each rule tree performs both:
+    1. Reference expansion ($ref: path) - structural replacement
+    2. Variable substitution (${vars.name}) - type-aware value replacement,
+       applied to the rule's inline values and to referenced templates alike
 
     Example:
         >>> refs = {
@@ -83,9 +104,40 @@ class RuleResolver:
             self.vars.update(instance_vars)
             logger.debug(f"Applied instance '{instance_id}' variable overrides: {list(instance_vars.keys())}")
 
+        # Flat 'group.name' -> template table so ref lookups are a single dict get
+        self._ref_table = self._build_ref_table()
+
+        # Memoized ref expansions keyed by (ref_path, allowed_groups)
+        self._ref_cache: Dict[Tuple[str, Optional[Tuple[str, ...]]], Any] = {}
+
+    def clear_cache(self) -> None:
+        """
+        Drop memoized refs after mutating ``vars``, ``conditions`` or ``actions``
+        """
+        self._ref_table = self._build_ref_table()
+        self._ref_cache.clear()
+
+    def _build_ref_table(self) -> Dict[str, Any]:
+        """
+        Flatten the conditions and actions groups into a 'group.name' keyed table
+
+        Returns:
+            Dictionary mapping full reference paths to their templates
+        """
+        table = {f"conditions.{name}": template for name, template in (self.conditions or {}).items()}
+        table.update({f"actions.{name}": template for name, template in (self.actions or {}).items()})
+        return table
+
     def resolve_rule(self, rule: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Fully resolve a rule: expand refs, then substitute variables
+        Fully resolve a rule: expand refs and substitute variables in one pass
+
+        Expanded refs are memoized and shared between the rules that use
+        them - treat the returned structure as read-only.
+
+        Fields are walked in rule order, depth first, and the first problem
+        found is raised. A rule with several errors therefore reports the one
+        that appears first, whether it is a ref or a variable error.
 
         Args:
             rule: Raw rule dictionary from config
@@ -101,186 +153,227 @@ class RuleResolver:
             CircularRefError: Circular reference dependency detected
             RefTypeMismatchError: Reference type does not match context
         """
-        # Phase 1: Deep copy to avoid mutating original
-        resolved = copy.deepcopy(rule)
-
         # Get rule name for error messages
         rule_name = rule.get('name', 'unknown')
 
-        # Phase 2: Expand $ref references with context validation
-        # Process conditions separately (only allow conditions.* refs)
-        if 'conditions' in resolved:
-            resolved['conditions'] = self._expand_refs(
-                resolved['conditions'],
-                ref_stack=set(),
-                allowed_groups=['conditions'],
-                path=f"rules['{rule_name}'].conditions"
-            )
+        # One walk per top-level field builds a fresh tree (the original rule is
+        # never mutated), expanding $refs and substituting ${vars.*} as it goes.
+        # Conditions may only reference conditions.*, actions only actions.*,
+        # other fields are unrestricted.
+        resolved = {}
+        for key, value in rule.items():
+            if key == 'conditions':
+                allowed_groups = ['conditions']
+            elif key == 'actions':
+                allowed_groups = ['actions']
+            else:
+                allowed_groups = None
 
-        # Process actions separately (only allow actions.* refs)
-        if 'actions' in resolved:
-            resolved['actions'] = self._expand_refs(
-                resolved['actions'],
-                ref_stack=set(),
-                allowed_groups=['actions'],
-                path=f"rules['{rule_name}'].actions"
+            resolved[key] = self._resolve(
+                value,
+                allowed_groups=allowed_groups,
+                path=f"rules['{rule_name}'].{key}"
             )
 
-        # Process other fields without ref type restrictions
-        for key in resolved:
-            if key not in ('conditions', 'actions', 'name'):
-                resolved[key] = self._expand_refs(
-                    resolved[key],
-                    ref_stack=set(),
-                    allowed_groups=None,  # No restrictions for other fields
-                    path=f"rules['{rule_name}'].{key}"
-                )
-
-        # Phase 3: Substitute all ${vars.*} variables (type-aware)
-        resolved = self._substitute_vars(resolved)
-
         return resolved
 
-    def _expand_refs(
+    def _resolve(
         self,
         node: Any,
-        ref_stack: Set[str],
         allowed_groups: Optional[List[str]] = None,
         path: str = ""
     ) -> Any:
         """
-        Recursively expand $ref references in a data structure
+        Expand $ref references and substitute variables in a data structure
+
+        Builds a fresh copy of ``node`` in a single traversal: ``$ref`` nodes are
+        replaced by their (walked) templates and strings have ``${vars.*}``
+        substituted via _substitute_string(). Variable values are inserted as-is.
+
+        Walks the tree with an explicit worklist instead of recursion, so each
+        node visit is one loop iteration rather than a Python call and deep
+        rule trees cannot hit the recursion limit. Each work item is
+        ``(container, slot, node, path)``: the expanded node is written to
+        ``container[slot]``.
+
+        A ``_RefDone`` marker is queued beneath each ref's content. Everything
+        above it belongs to that ref, so when it is popped the expansion is
+        finished: it is memoized per ``(ref_path, allowed_groups)`` for reuse by
+        later occurrences, and the ref leaves the active chain. The chain is a
+        single insertion-ordered dict mutated in place (push on entry, pop on
+        exit) - O(1) cycle checks with no per-ref allocation.
 
         Args:
-            node: Current node being processed (dict, list, or scalar)
-            ref_stack: Stack of reference paths to detect circular dependencies
+            node: Root node being processed (dict, list, or scalar)
             allowed_groups: List of allowed ref groups (e.g., ['conditions', 'actions'])
                           None = no restrictions (used for vars and other contexts)
-            path: Current path in the rule for error messages (e.g., "rules['test'].conditions[0]")
+            path: Path of ``node`` in the rule for error messages (e.g., "rules['test'].conditions[0]")
 
         Returns:
-            Node with all $ref references expanded
+            Node with all $ref references expanded and variables substituted
 
         Raises:
+            InvalidRefError: Invalid reference path format
+            UnknownRefError: Reference not found in refs
+            InvalidVariableError: Invalid variable path format
+            UnknownVariableError: Variable not found in refs.vars
+            CircularRefError: Circular reference dependency detected
             RefTypeMismatchError: Reference type does not match allowed_groups
+
+        Note:
+            Dispatches on ``type(node)`` rather than ``isinstance`` - rule trees
+            come from ``yaml.safe_load`` and only ever contain plain dicts/lists.
         """
-        if isinstance(node, dict):
-            # Check if this dict is a $ref node
-            if '$ref' in node:
-                ref_path = node['$ref']
-
-                # Validate path format
-                if not isinstance(ref_path, str) or '.' not in ref_path:
-                    raise InvalidRefError(
-                        ref_path=str(ref_path),
-                        reason="Path must be in format 'group.name'"
-                    )
-
-                # Extract ref group (e.g., 'conditions' from 'conditions.private-tracker')
-                ref_group = ref_path.split('.', 1)[0]
-
-                # First, validate that the group is a known group
-                valid_groups = ['conditions', 'actions']
-                if ref_group not in valid_groups:
-                    raise InvalidRefError(
-                        ref_path=ref_path,
-                        reason=f"Unknown group '{ref_group}'. Valid groups: conditions, actions"
-                    )
-
-                # Then, validate ref type against allowed_groups (context validation)
-                if allowed_groups is not None and ref_group not in allowed_groups:
-                    # Get available refs of the correct type
-                    available_refs = []
-                    if 'conditions' in allowed_groups and hasattr(self, 'conditions'):
-                        available_refs = list(self.conditions.keys())
-                    elif 'actions' in allowed_groups and hasattr(self, 'actions'):
-                        available_refs = list(self.actions.keys())
-
-                    raise RefTypeMismatchError(
-                        ref_path=ref_path,
-                        allowed_groups=allowed_groups,
-                        actual_group=ref_group,
-                        location=path,
-                        available_refs=available_refs
-                    )
-
-                # Detect circular dependencies
-                if ref_path in ref_stack:
-                    raise CircularRefError(ref_path=ref_path, ref_stack=list(ref_stack))
-
-                # Look up and expand reference
-                expanded = self._lookup_ref(ref_path)
-
-                # Recursively expand the referenced content
-                new_stack = ref_stack | {ref_path}
-                return self._expand_refs(expanded, new_stack, allowed_groups, path)
-            else:
-                # Regular dict - recursively process each value
-                return {
-                    key: self._expand_refs(
+        root: List[Any] = [None]
+        work: List[_Frame] = [(root, 0, node, path)]
+        groups_key = tuple(allowed_groups) if allowed_groups is not None else None
+        # Refs currently being expanded, outermost first (dict as an ordered set)
+        active_refs: Dict[str, None] = {}
+
+        while work:
+            container, slot, node, node_path = work.pop()
+            node_type = type(node)
+
+            if node_type is dict:
+                # $ref node - validate, then re-queue the referenced content in its place
+                if '$ref' in node:
+                    ref_path = self._validate_ref(node['$ref'], active_refs, allowed_groups, node_path)
+                    cache_key = (ref_path, groups_key)
+                    if cache_key in self._ref_cache:
+                        container[slot] = self._ref_cache[cache_key]
+                        continue
+                    expanded = self._lookup_ref(ref_path)
+                    active_refs[ref_path] = None
+                    work.append((container, slot, _RefDone(cache_key), node_path))
+                    work.append((container, slot, expanded, node_path))
+                    continue
+
+                # Regular dict - create the output now (keeps key order), fill values later
+                expanded_dict = dict.fromkeys(node)
+                container[slot] = expanded_dict
+                # Push in reverse so children are visited (and errors raised) in document order
+                for key, value in reversed(list(node.items())):
+                    work.append((
+                        expanded_dict,
+                        key,
                         value,
-                        ref_stack,
-                        allowed_groups,
-                        f"{path}.{key}" if path else key
-                    )
-                    for key, value in node.items()
-                }
-
-        elif isinstance(node, list):
-            # Recursively process each list item
-            return [
-                self._expand_refs(
-                    item,
-                    ref_stack,
-                    allowed_groups,
-                    f"{path}[{i}]"
-                )
-                for i, item in enumerate(node)
-            ]
+                        f"{node_path}.{key}" if node_path else key
+                    ))
 
-        else:
-            # Scalar value - return as-is
-            return node
+            elif node_type is list:
+                expanded_list = [None] * len(node)
+                container[slot] = expanded_list
+                for i in range(len(node) - 1, -1, -1):
+                    work.append((expanded_list, i, node[i], f"{node_path}[{i}]"))
+
+            elif node_type is str:
+                container[slot] = self._substitute_string(node)
+
+            elif node_type is _RefDone:
+                # Everything queued above the marker is done - the ref is fully expanded
+                self._ref_cache[node.key] = container[slot]
+                del active_refs[node.key[0]]
+
+            else:
+                # Scalar value - as-is
+                container[slot] = node
 
-    def _substitute_vars(self, node: Any) -> Any:
+        return root[0]
+
+    def _validate_ref(
+        self,
+        ref_path: Any,
+        active_refs: Dict[str, None],
+        allowed_groups: Optional[List[str]],
+        path: str
+    ) -> str:
         """
-        Recursively substitute ${vars.*} variables in a data structure
+        Validate a $ref path before it is expanded
+
+        Args:
+            ref_path: Value of the $ref key
+            active_refs: Reference paths currently being expanded, outermost first
+            allowed_groups: Allowed ref groups for this location, or None
+            path: Location in the rule for error messages
+
+        Returns:
+            The validated reference path
+
+        Raises:
+            InvalidRefError: Invalid path format or unknown group
+            RefTypeMismatchError: Reference type does not match allowed_groups
+            CircularRefError: Reference is already being expanded
+        """
+        # Validate path format
+        if not isinstance(ref_path, str) or '.' not in ref_path:
+            raise InvalidRefError(
+                ref_path=str(ref_path),
+                reason="Path must be in format 'group.name'"
+            )
+
+        # Extract ref group (e.g., 'conditions' from 'conditions.private-tracker')
+        ref_group = ref_path.split('.', 1)[0]
+
+        # First, validate that the group is a known group
+        valid_groups = ['conditions', 'actions']
+        if ref_group not in valid_groups:
+            raise InvalidRefError(
+                ref_path=ref_path,
+                reason=f"Unknown group '{ref_group}'. Valid groups: conditions, actions"
+            )
+
+        # Then, validate ref type against allowed_groups (context validation)
+        if allowed_groups is not None and ref_group not in allowed_groups:
+            # Get available refs of the correct type
+            available_refs = []
+            if 'conditions' in allowed_groups and hasattr(self, 'conditions'):
+                available_refs = list(self.conditions.keys())
+            elif 'actions' in allowed_groups and hasattr(self, 'actions'):
+                available_refs = list(self.actions.keys())
+
+            raise RefTypeMismatchError(
+                ref_path=ref_path,
+                allowed_groups=allowed_groups,
+                actual_group=ref_group,
+                location=path,
+                available_refs=available_refs
+            )
+
+        # Detect circular dependencies
+        if ref_path in active_refs:
+            raise CircularRefError(ref_path=ref_path, ref_stack=list(active_refs))
+
+        return ref_path
+
+    def _substitute_string(self, node: str) -> Any:
+        """
+        Substitute ${vars.*} variables in a string
 
         Type-aware substitution:
         - If ${vars.x} is the entire string value → preserve original type
         - If ${vars.x} is embedded in string → interpolate as string
 
         Args:
-            node: Current node being processed
+            node: String value from a rule or ref template
 
         Returns:
-            Node with all variables substituted
+            Substituted value
         """
-        if isinstance(node, dict):
-            return {key: self._substitute_vars(value) for key, value in node.items()}
-
-        elif isinstance(node, list):
-            return [self._substitute_vars(item) for item in node]
-
-        elif isinstance(node, str):
-            # Check if entire string is a single variable reference
-            if node.startswith('${') and node.endswith('}') and node.count('${') == 1:
-                # Extract variable path
-                var_path = node[2:-1]  # Remove ${ and }
-                # Preserve original type
-                return self._resolve_var(var_path)
+        # Fast reject - most strings (fields, operators, names) have no variables
+        if '${' not in node:
+            return node
 
-            # String with embedded variables - interpolate
-            def replace_var(match):
-                var_path = match.group(1)
-                value = self._resolve_var(var_path)
-                return str(value)
+        # Check if entire string is a single variable reference - preserve original type
+        match = WHOLE_VAR_PATTERN.match(node)
+        if match:
+            return self._resolve_var(match.group(1))
 
-            return VAR_PATTERN.sub(replace_var, node)
+        # String with embedded variables - interpolate
+        return VAR_PATTERN.sub(self._replace_var_match, node)
 
-        else:
-            # Scalar non-string value - return as-is
-            return node
+    def _replace_var_match(self, match: 're.Match') -> str:
+        """Regex callback interpolating an embedded ${vars.*} match as a string"""
+        return str(self._resolve_var(match.group(1)))
 
     def _lookup_ref(self, ref_path: str) -> Any:
         """
@@ -290,7 +383,7 @@ class RuleResolver:
             ref_path: Reference path like 'conditions.private-tracker'
 
         Returns:
-            Referenced structure
+            Referenced structure (raw template - _resolve() substitutes variables)
 
         Raises:
             InvalidRefError: Invalid path format or unknown group
@@ -298,8 +391,14 @@ class RuleResolver:
 
         Note:
             Context validation (e.g., ensuring actions.* refs aren't used in conditions)
-            is handled by _expand_refs() before calling this method.
+            is handled by _resolve() before calling this method.
         """
+        # Hot path - known refs resolve with one dict lookup
+        template = self._ref_table.get(ref_path, _MISSING)
+        if template is not _MISSING:
+            return template
+
+        # Miss - work out which error to raise
         parts = ref_path.split('.', 1)
         if len(parts) != 2:
             raise InvalidRefError(
@@ -8,25 +8,189 @@ Provides REST API for:
 - Authentication via API key
 """
 
+import logging
 import os
 import secrets
-import logging
+import time
 from datetime import datetime, timezone
-from typing import Dict, Any
 from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, cast
 
-from flask import Flask, request, jsonify, Response
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 
-from qbt_rules.queue_manager import QueueManager, JobStatus
-from qbt_rules.worker import Worker
 from qbt_rules.__version__ import __version__
+from qbt_rules.queue_manager import JobStatus, QueueManager
+from qbt_rules.worker import Worker
+
+# orjson is optional - used to encode API responses when installed
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
 # Global references (set by create_app)
-queue: QueueManager = None
-worker: Worker = None
-api_key_config: str = None
+queue: Optional[QueueManager] = None
+worker: Optional[Worker] = None
+api_key_config: Optional[str] = None
+api_key_bytes: Optional[bytes] = None
+queue_backend_name: Optional[str] = None
+
+# /api/version never changes within a process - serialized once per app
+VERSION_INFO = {
+    'version': __version__,
+    'api_version': '1.0',
+    'python_version': os.sys.version.split()[0]
+}
+
+# Seconds a /api/health response is served from cache (probes hit it constantly)
+HEALTH_CACHE_TTL = 1.0
+HEALTH_PATH = '/api/health'
+
+
+# (epoch second, ISO string) for now_iso() - replaced atomically, refreshed once a second
+_timestamp_cache: Tuple[int, str] = (0, '')
+
+
+def now_iso() -> str:
+    """
+    Current UTC time as an ISO 8601 string, at one-second resolution
+
+    The string is formatted at most once per second and shared by every
+    response within that second.
+
+    Returns:
+        Timestamp like '2025-01-01T12:00:00+00:00'
+    """
+    global _timestamp_cache
+
+    second = int(time.time())
+    cached = _timestamp_cache
+    if cached[0] != second:
+        cached = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+        _timestamp_cache = cached
+    return cached[1]
+
+
+def _response_obj(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    """Combine ``jsonify``-style arguments into one object (same rules as Flask)"""
+    if args and kwargs:
+        raise TypeError("app.json.response() takes either args or kwargs, not both")
+    if not args and not kwargs:
+        return None
+    if len(args) == 1:
+        return args[0]
+    return args or kwargs
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson
+
+    Keeps every ``jsonify`` call site unchanged while moving encoding to
+    orjson's native serializer. Keys are sorted and datetimes are passed
+    through to Flask's ``default`` hook (HTTP date strings), as are other
+    objects orjson cannot handle. Payloads orjson rejects outright, such as
+    integers wider than 64 bits, are encoded by Flask's default provider.
+
+    The output still differs from Flask's default provider in a few ways:
+    non-ASCII text is sent as UTF-8 instead of ``\\uXXXX`` escapes, NaN and
+    Infinity become ``null``, and dicts mixing int and str keys are encoded
+    instead of raising TypeError.
+    """
+
+    def _options(self) -> int:
+        """orjson option flags for the current provider settings"""
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a JSON string"""
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize arguments straight to a JSON response body"""
+        obj = _response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            return cast(Response, super().response(*args, **kwargs))
+        return Response(body, mimetype=self.mimetype)
+
+
+class HealthCheckCache:
+    """
+    WSGI middleware that answers repeated health probes from a cached response
+
+    The first GET /api/health goes through Flask as usual; its status, headers
+    and body are kept for ``ttl`` seconds and replayed verbatim to later probes,
+    skipping routing, the queue/worker checks and JSON encoding. Every other
+    request is passed straight through.
+    """
+
+    def __init__(self, wsgi_app: Callable[..., Iterable[bytes]], ttl: float = HEALTH_CACHE_TTL):
+        """
+        Args:
+            wsgi_app: Wrapped WSGI application (Flask's ``app.wsgi_app``)
+            ttl: Seconds a cached health response stays fresh (0 disables caching)
+        """
+        self.wsgi_app = wsgi_app
+        self.ttl = ttl
+        # (expires_at, status, headers, body) - replaced atomically
+        self._cached: Optional[Tuple[float, str, List[Tuple[str, str]], bytes]] = None
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable) -> Iterable[bytes]:
+        if (
+            self.ttl <= 0
+            or environ.get('PATH_INFO') != HEALTH_PATH
+            or environ.get('REQUEST_METHOD') != 'GET'
+        ):
+            return self.wsgi_app(environ, start_response)
+
+        cached = self._cached
+        if cached is not None and cached[0] > time.monotonic():
+            start_response(cached[1], list(cached[2]))
+            return [cached[3]]
+
+        captured = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+            return start_response(status, headers, exc_info)
+
+        result = self.wsgi_app(environ, capture_start_response)
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+        self._cached = (time.monotonic() + self.ttl, captured['status'], list(captured['headers']), body)
+        return [body]
+
+
+def _active_queue() -> QueueManager:
+    """Queue installed by create_app()"""
+    if queue is None:
+        raise RuntimeError("Queue not initialised - call create_app() first")
+    return queue
+
+
+def _active_worker() -> Worker:
+    """Worker installed by create_app()"""
+    if worker is None:
+        raise RuntimeError("Worker not initialised - call create_app() first")
+    return worker
 
 
 def create_app(queue_manager: QueueManager, worker_instance: Worker, api_key: str) -> Flask:
@@ -41,14 +205,18 @@ def create_app(queue_manager: QueueManager, worker_instance: Worker, api_key: st
     Returns:
         Configured Flask app
     """
-    global queue, worker, api_key_config
+    global queue, worker, api_key_config, api_key_bytes, queue_backend_name
 
     queue = queue_manager
     worker = worker_instance
     api_key_config = api_key
+    api_key_bytes = api_key.encode('utf-8') if api_key is not None else None
+    queue_backend_name = queue_manager.__class__.__name__
 
     app = Flask(__name__)
     app.config['JSON_SORT_KEYS'] = False
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
 
     # Disable Flask's default logger (use our configured logger instead)
     app.logger.disabled = True
@@ -57,6 +225,9 @@ def create_app(queue_manager: QueueManager, worker_instance: Worker, api_key: st
     # Register blueprints/routes
     register_routes(app)
 
+    # Serve repeated health probes without going through Flask
+    app.wsgi_app = HealthCheckCache(app.wsgi_app)  # type: ignore[method-assign]
+
     logger.info("Flask application created")
     return app
 
@@ -66,18 +237,18 @@ def require_api_key(f):
     Decorator for endpoints requiring API key authentication
 
     Checks for API key in:
-    1. Query parameter: ?key=xxx
-    2. Header: X-API-Key: xxx
+    1. Header: X-API-Key: xxx
+    2. Query parameter: ?key=xxx
 
     Returns 401 if missing or invalid.
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        # Get API key from query param or header
-        key = request.args.get('key') or request.headers.get('X-API-Key')
+        # Header first - the query string is only parsed when no header is sent
+        key = request.headers.get('X-API-Key') or request.args.get('key')
 
-        # Constant-time comparison to prevent timing attacks
-        if not key or not secrets.compare_digest(key, api_key_config):
+        # Constant-time comparison to prevent timing attacks (bytes - safe for non-ASCII keys)
+        if not key or api_key_bytes is None or not secrets.compare_digest(key.encode('utf-8'), api_key_bytes):
             return jsonify({
                 'error': 'Unauthorized',
                 'message': 'Invalid or missing API key'
@@ -91,6 +262,10 @@ def require_api_key(f):
 def register_routes(app: Flask):
     """Register all API routes"""
 
+    # Encoded with the app's JSON provider so it matches every other endpoint
+    with app.app_context():
+        version_body = jsonify(VERSION_INFO).get_data()
+
     @app.route('/api/execute', methods=['POST'])
     @require_api_key
     def execute():
@@ -112,10 +287,10 @@ def register_routes(app: Flask):
 
         try:
             # Enqueue job
-            job_id = queue.enqueue(context=context, hash_filter=hash_filter)
+            job_id = _active_queue().enqueue(context=context, hash_filter=hash_filter)
 
             # Get full job details
-            job = queue.get_job(job_id)
+            job = _active_queue().get_job(job_id)
 
             logger.info(f"Job queued: {job_id} (context={context}, hash={hash_filter})")
 
@@ -158,14 +333,14 @@ def register_routes(app: Flask):
             }), 400
 
         try:
-            jobs = queue.list_jobs(
+            jobs = _active_queue().list_jobs(
                 status=status,
                 context=context,
                 limit=limit,
                 offset=offset
             )
 
-            total = queue.count_jobs(status=status)
+            total = _active_queue().count_jobs(status=status)
 
             return jsonify({
                 'total': total,
@@ -198,7 +373,7 @@ def register_routes(app: Flask):
             404: Job not found
             401: Unauthorized
         """
-        job = queue.get_job(job_id)
+        job = _active_queue().get_job(job_id)
 
         if not job:
             return jsonify({
@@ -226,7 +401,7 @@ def register_routes(app: Flask):
             404: Job not found
             401: Unauthorized
         """
-        job = queue.get_job(job_id)
+        job = _active_queue().get_job(job_id)
 
         if not job:
             return jsonify({
@@ -240,7 +415,7 @@ def register_routes(app: Flask):
                 'message': f"Cannot cancel job in status: {job['status']}"
             }), 400
 
-        success = queue.cancel_job(job_id)
+        success = _active_queue().cancel_job(job_id)
 
         if success:
             logger.info(f"Job cancelled: {job_id}")
@@ -266,16 +441,19 @@ def register_routes(app: Flask):
         """
         errors = []
 
+        # Health, depth and counts in one backend round trip
+        snapshot = _active_queue().snapshot()
+
         # Check queue backend
-        if not queue.health_check():
+        if not snapshot['healthy']:
             errors.append("Queue backend not accessible")
 
         # Check worker
-        if not worker.is_alive():
+        if not _active_worker().is_alive():
             errors.append("Worker thread not running")
 
         # Check for stuck processing jobs
-        processing_count = queue.count_jobs(JobStatus.PROCESSING)
+        processing_count = snapshot['counts'][JobStatus.PROCESSING]
         if processing_count > 5:  # Arbitrary threshold
             errors.append(f"Too many processing jobs: {processing_count}")
 
@@ -283,25 +461,25 @@ def register_routes(app: Flask):
             return jsonify({
                 'status': 'unhealthy',
                 'errors': errors,
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso()
             }), 503
 
-        # Healthy response
-        worker_status = worker.get_status()
+        # Healthy response - depth already came from the snapshot
+        worker_status = _active_worker().get_status(include_queue_depth=False)
 
         return jsonify({
             'status': 'healthy',
             'version': __version__,
             'queue': {
-                'backend': queue.__class__.__name__,
-                'pending_jobs': queue.get_queue_depth(),
-                'processing_jobs': queue.count_jobs(JobStatus.PROCESSING)
+                'backend': queue_backend_name,
+                'pending_jobs': snapshot['depth'],
+                'processing_jobs': processing_count
             },
             'worker': {
                 'status': 'running' if worker_status['running'] else 'stopped',
                 'last_job_completed': worker_status['last_job_completed']
             },
-            'timestamp': datetime.now(timezone.utc).isoformat()
+            'timestamp': now_iso()
         }), 200
 
     @app.route('/api/stats', methods=['GET'])
@@ -318,8 +496,8 @@ def register_routes(app: Flask):
             401: Unauthorized
         """
         try:
-            queue_stats = queue.get_stats()
-            worker_status = worker.get_status()
+            queue_stats = _active_queue().get_stats()
+            worker_status = _active_worker().get_status(include_queue_depth=False)
 
             return jsonify({
                 'jobs': {
@@ -334,14 +512,14 @@ def register_routes(app: Flask):
                     'average_execution_time': f"{queue_stats['average_execution_time']}s" if queue_stats['average_execution_time'] else None,
                 },
                 'queue': {
-                    'backend': queue.__class__.__name__,
-                    'depth': queue.get_queue_depth()
+                    'backend': queue_backend_name,
+                    'depth': _active_queue().get_queue_depth()
                 },
                 'worker': {
                     'status': 'running' if worker_status['running'] else 'stopped',
                     'last_job_completed': worker_status['last_job_completed']
                 },
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': now_iso()
             }), 200
 
         except Exception as e:
@@ -359,11 +537,7 @@ def register_routes(app: Flask):
         Returns:
             200: Version info
         """
-        return jsonify({
-            'version': __version__,
-            'api_version': '1.0',
-            'python_version': os.sys.version.split()[0]
-        }), 200
+        return Response(version_body, status=200, mimetype='application/json')
 
     @app.errorhandler(404)
     def not_found(error):
@@ -388,6 +562,7 @@ def run_server(
     host: str = '0.0.0.0',
     port: int = 5000,
     workers: int = 1,
+    threads: int = 8,
     log_http_access: bool = False
 ):
     """
@@ -398,6 +573,7 @@ def run_server(
         host: Bind address
         port: Bind port
         workers: Number of Gunicorn workers
+        threads: Request threads per worker (gthread worker class)
         log_http_access: Enable HTTP access logging (default: False to suppress health checks)
     """
     from gunicorn.app.base import BaseApplication
@@ -440,8 +616,8 @@ def run_server(
         """
         logger.info(f"Gunicorn worker {worker_process.pid} forked - restarting worker thread")
 
-        # Import here to access the global worker instance
-        from qbt_rules.server import worker as worker_instance
+        # Global worker instance set by create_app()
+        worker_instance = _active_worker()
 
         # Stop any existing thread (should be dead anyway after fork)
         if worker_instance.running:
@@ -454,7 +630,8 @@ def run_server(
     options = {
         'bind': f'{host}:{port}',
         'workers': workers,
-        'worker_class': 'sync',
+        'worker_class': 'gthread',  # Threaded workers - endpoints mostly wait on the queue backend
+        'threads': threads,
         'timeout': 120,
         'accesslog': '-',  # Log to stdout
         'errorlog': '-',   # Log to stderr
@@ -464,7 +641,7 @@ def run_server(
         'post_fork': post_fork,  # Restart worker thread after fork
     }
 
-    logger.info(f"Starting Gunicorn server on {host}:{port} with {workers} worker(s)")
+    logger.info(f"Starting Gunicorn server on {host}:{port} with {workers} worker(s) x {threads} thread(s)")
 
     app_instance = StandaloneApplication(app, options)
     app_instance.run()
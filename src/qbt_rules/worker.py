@@ -9,8 +9,8 @@ import threading
 import time
 import logging
 import traceback
-from typing import Optional, Dict, Any
-from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Callable
+from datetime import datetime, timedelta, timezone
 
 from qbt_rules.queue_manager import QueueManager, JobStatus
 from qbt_rules.api import QBittorrentAPI
@@ -24,7 +24,7 @@ class Worker:
     """
     Background worker that processes queued jobs
 
-    Runs in a separate thread, continuously polling the queue for pending jobs.
+    Runs in a separate thread, blocking on the queue until a job is pending.
     Each job is executed sequentially using the RulesEngine.
     """
 
@@ -33,7 +33,8 @@ class Worker:
         queue: QueueManager,
         api: QBittorrentAPI,
         config: Config,
-        poll_interval: float = 1.0
+        poll_interval: float = 1.0,
+        engine_factory: Optional[Callable[..., RulesEngine]] = None
     ):
         """
         Initialize worker
@@ -42,19 +43,51 @@ class Worker:
             queue: Queue manager instance
             api: qBittorrent API client
             config: Configuration object
-            poll_interval: Seconds to wait between queue polls (default: 1.0)
+            poll_interval: Maximum seconds to block waiting for a job (default: 1.0)
+            engine_factory: Called with api, config and dry_run to build the
+                engine (default: RulesEngine)
         """
         self.queue = queue
         self.api = api
         self.config = config
         self.poll_interval = poll_interval
+        self._engine_factory = engine_factory
 
-        self.running = False
+        # Set while the worker is stopped; the loop and error backoff wait on it
+        self._stop_event = threading.Event()
+        self._stop_event.set()
         self.thread: Optional[threading.Thread] = None
-        self.last_job_completed: Optional[datetime] = None
+        self._last_job_completed: Optional[datetime] = None
+        self._last_job_completed_iso: Optional[str] = None
+
+        # Built on first job and reused - api/config are fixed for the worker's lifetime
+        self._engine: Optional[RulesEngine] = None
 
         logger.info("Worker initialized")
 
+    @property
+    def running(self) -> bool:
+        """Whether the worker loop has been started and not yet asked to stop"""
+        return not self._stop_event.is_set()
+
+    @running.setter
+    def running(self, value: bool):
+        if value:
+            self._stop_event.clear()
+        else:
+            self._stop_event.set()
+
+    @property
+    def last_job_completed(self) -> Optional[datetime]:
+        """Completion time of the most recent successful job"""
+        return self._last_job_completed
+
+    @last_job_completed.setter
+    def last_job_completed(self, value: Optional[datetime]):
+        # Format once per job rather than on every status request
+        self._last_job_completed = value
+        self._last_job_completed_iso = value.isoformat() if value else None
+
     def start(self):
         """Start worker thread"""
         # Check if truly running (thread exists and is alive)
@@ -63,7 +96,7 @@ class Worker:
             return
 
         # Reset state and start new thread
-        self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._run_loop, daemon=False, name="worker")
         self.thread.start()
         logger.info("Worker thread started")
@@ -79,13 +112,14 @@ class Worker:
             return
 
         logger.info("Stopping worker...")
-        self.running = False
+        self._stop_event.set()
+        self.queue.wake()
 
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=timeout)
 
             if self.thread.is_alive():
-                logger.warning(f"Worker did not stop within {timeout}s timeout")
+                logger.warning("Worker did not stop within %ss timeout", timeout)
             else:
                 logger.info("Worker stopped gracefully")
 
@@ -93,39 +127,43 @@ class Worker:
         """Check if worker thread is alive"""
         return self.thread is not None and self.thread.is_alive()
 
-    def get_status(self) -> Dict[str, Any]:
+    def get_status(self, include_queue_depth: bool = True) -> Dict[str, Any]:
         """
         Get worker status
 
+        Args:
+            include_queue_depth: Query the queue for its depth (callers that
+                already have it from the backend can skip the round trip)
+
         Returns:
             Dictionary with worker status information
         """
-        return {
+        status: Dict[str, Any] = {
             'running': self.running,
             'thread_alive': self.is_alive(),
-            'last_job_completed': self.last_job_completed.isoformat() if self.last_job_completed else None,
-            'queue_depth': self.queue.get_queue_depth()
+            'last_job_completed': self._last_job_completed_iso,
         }
+        if include_queue_depth:
+            status['queue_depth'] = self.queue.get_queue_depth()
+        return status
 
     def _run_loop(self):
         """Main worker loop - runs in separate thread"""
         logger.info("Worker loop started")
 
-        while self.running:
+        while not self._stop_event.is_set():
             try:
-                # Try to dequeue a job
-                job = self.queue.dequeue()
+                # Wait for a job; enqueue() and stop() wake us early
+                job = self.queue.dequeue_blocking(timeout=self.poll_interval)
 
                 if job:
                     # Process job
                     self._process_job(job)
-                else:
-                    # Queue empty, sleep and retry
-                    time.sleep(self.poll_interval)
 
             except Exception as e:
-                logger.error(f"Unexpected error in worker loop: {e}", exc_info=True)
-                time.sleep(self.poll_interval)
+                logger.error("Unexpected error in worker loop: %s", e, exc_info=True)
+                # Back off, but return at once if stop() is called meanwhile
+                self._stop_event.wait(self.poll_interval)
 
         logger.info("Worker loop exited")
 
@@ -140,16 +178,19 @@ class Worker:
         context = job.get('context')
         hash_filter = job.get('hash')
 
-        logger.info(f"Processing job {job_id} (context={context}, hash={hash_filter})")
+        logger.info("Processing job %s (context=%s, hash=%s)", job_id, context, hash_filter)
 
+        # One wall-clock read for persistence; durations use the monotonic clock
         started_at = datetime.now(timezone.utc)
+        start_time = time.monotonic()
 
         try:
             # Execute job via RulesEngine
             result = self._execute_job(context, hash_filter)
 
             # Mark job as completed
-            completed_at = datetime.now(timezone.utc)
+            execution_time = time.monotonic() - start_time
+            completed_at = started_at + timedelta(seconds=execution_time)
             self.queue.update_status(
                 job_id=job_id,
                 status=JobStatus.COMPLETED,
@@ -160,30 +201,34 @@ class Worker:
 
             self.last_job_completed = completed_at
 
-            execution_time = (completed_at - started_at).total_seconds()
+            # %-style args: formatting is skipped when the record is filtered out
             logger.info(
-                f"Job {job_id} completed successfully in {execution_time:.2f}s "
-                f"(torrents: {result.get('torrents_processed', 0)}, "
-                f"rules matched: {result.get('rules_matched', 0)}, "
-                f"actions: {result.get('actions_executed', 0)})"
+                "Job %s completed successfully in %.2fs (torrents: %s, rules matched: %s, actions: %s)",
+                job_id, execution_time,
+                result.get('torrents_processed', 0),
+                result.get('rules_matched', 0),
+                result.get('actions_executed', 0)
             )
 
         except Exception as e:
-            # Mark job as failed
+            # Mark job as failed - format the traceback only when it will be used
             error_msg = f"{type(e).__name__}: {str(e)}"
-            error_trace = traceback.format_exc()
+            error_trace = None
+            if logger.isEnabledFor(logging.DEBUG) or self.config.store_tracebacks():
+                error_trace = traceback.format_exc()
 
-            completed_at = datetime.now(timezone.utc)
+            completed_at = started_at + timedelta(seconds=time.monotonic() - start_time)
             self.queue.update_status(
                 job_id=job_id,
                 status=JobStatus.FAILED,
                 started_at=started_at,
                 completed_at=completed_at,
-                error=error_trace
+                error=error_trace or error_msg
             )
 
-            logger.error(f"Job {job_id} failed: {error_msg}")
-            logger.debug(f"Job {job_id} traceback:\n{error_trace}")
+            logger.error("Job %s failed: %s", job_id, error_msg)
+            if error_trace and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Job %s traceback:\n%s", job_id, error_trace)
 
     def _execute_job(self, context: Optional[str], hash_filter: Optional[str]) -> Dict[str, Any]:
         """
@@ -199,15 +244,12 @@ class Worker:
         Raises:
             Exception: Any error during execution (will be caught and logged)
         """
-        # Determine dry-run mode from config
+        # Read per job so a dry-run change applies without restarting the worker
         dry_run = self.config.is_dry_run()
 
-        # Create RulesEngine instance
-        engine = RulesEngine(
-            api=self.api,
-            config=self.config,
-            dry_run=dry_run
-        )
+        engine = self._get_engine()
+        engine.reset_stats()
+        engine.set_dry_run(dry_run)
 
         # Execute rules
         engine.run(context=context, torrent_hash=hash_filter)
@@ -227,5 +269,21 @@ class Worker:
 
         return result
 
+    def _get_engine(self) -> RulesEngine:
+        """
+        Get the worker's RulesEngine, creating it on first use
+
+        Returns:
+            RulesEngine shared by all jobs of this worker
+        """
+        if self._engine is None:
+            factory = self._engine_factory or RulesEngine
+            self._engine = factory(
+                api=self.api,
+                config=self.config,
+                dry_run=self.config.is_dry_run()
+            )
+        return self._engine
+
     def __repr__(self) -> str:
         return f"<Worker running={self.running} alive={self.is_alive()}>"
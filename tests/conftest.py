@@ -51,6 +51,9 @@ class MockQBittorrentAPI:
         self.peers_data = {}
         self.properties_data = {}
         self.webseeds_data = {}
+        # hash -> (tags CSV the set was parsed from, set of tags); the public
+        # 'tags' CSV stays authoritative since tests assign torrents directly
+        self._tag_sets: Dict[str, tuple] = {}
         self.transfer_info_data = {
             'dl_info_speed': 1048576,  # 1 MB/s
             'up_info_speed': 524288,   # 512 KB/s
@@ -79,16 +82,41 @@ class MockQBittorrentAPI:
 
     def get_torrents(self, category=None, tag=None, hashes=None):
         """Get torrents list with optional filters."""
-        torrents = list(self.torrents_data.values())
-
-        if category:
-            torrents = [t for t in torrents if t.get('category') == category]
-        if tag:
-            torrents = [t for t in torrents if tag in t.get('tags', '').split(',')]
         if hashes:
-            torrents = [t for t in torrents if t['hash'] in hashes]
+            # torrents_data is already keyed by hash - look the requested ones up directly
+            candidates = [self.torrents_data[h] for h in dict.fromkeys(hashes) if h in self.torrents_data]
+        else:
+            candidates = self.torrents_data.values()
+
+        # Remaining filters in a single pass; category/tag are not indexed because
+        # tests mutate torrent dicts directly, which would leave an index stale
+        return [
+            t for t in candidates
+            if (not category or t.get('category') == category)
+            and (not tag or tag in self._tags_of(t['hash'], t))
+        ]
 
-        return torrents
+    def _tags_of(self, torrent_hash, torrent):
+        """Tag set for a torrent, re-parsed only when its 'tags' CSV changed."""
+        tags_str = torrent.get('tags', '')
+        cached = self._tag_sets.get(torrent_hash)
+        if cached is None or cached[0] != tags_str:
+            cached = (tags_str, {t.strip() for t in tags_str.split(',') if t.strip()})
+            self._tag_sets[torrent_hash] = cached
+        return cached[1]
+
+    def _store_tags(self, torrent_hash, torrent, tag_set):
+        """Write a tag set back as the public CSV and remember it."""
+        tags_str = ','.join(tag_set)
+        torrent['tags'] = tags_str
+        self._tag_sets[torrent_hash] = (tags_str, tag_set)
+
+    @staticmethod
+    def _clean_tags(tags):
+        """Normalise tags to a set; a single string (valid in rules YAML) is one tag."""
+        if isinstance(tags, str):
+            tags = [tags]
+        return {t.strip() for t in tags if t.strip()}
 
     def get_trackers(self, torrent_hash):
         """Get trackers for a torrent."""
@@ -126,29 +154,31 @@ class MockQBittorrentAPI:
         """Get API version."""
         return "v2.9.3"
 
+    def _set_field(self, hashes, field, value):
+        """Set one field on every known torrent in hashes."""
+        torrents = self.torrents_data
+        for hash in hashes:
+            torrent = torrents.get(hash)
+            if torrent is not None:
+                torrent[field] = value
+
     # Action methods that track calls
     def stop_torrents(self, hashes):
         """Stop torrents."""
         self.calls['stop'].append(hashes)
-        for hash in hashes:
-            if hash in self.torrents_data:
-                self.torrents_data[hash]['state'] = 'pausedDL'
+        self._set_field(hashes, 'state', 'pausedDL')
         return True
 
     def start_torrents(self, hashes):
         """Start torrents."""
         self.calls['start'].append(hashes)
-        for hash in hashes:
-            if hash in self.torrents_data:
-                self.torrents_data[hash]['state'] = 'downloading'
+        self._set_field(hashes, 'state', 'downloading')
         return True
 
     def force_start_torrents(self, hashes):
         """Force start torrents."""
         self.calls['force_start'].append(hashes)
-        for hash in hashes:
-            if hash in self.torrents_data:
-                self.torrents_data[hash]['state'] = 'forceDL'
+        self._set_field(hashes, 'state', 'forceDL')
         return True
 
     def recheck_torrents(self, hashes):
@@ -164,59 +194,49 @@ class MockQBittorrentAPI:
     def delete_torrents(self, hashes, delete_files=False):
         """Delete torrents."""
         self.calls['delete'].append({'hashes': hashes, 'delete_files': delete_files})
+        torrents = self.torrents_data
         for hash in hashes:
-            if hash in self.torrents_data:
-                del self.torrents_data[hash]
+            torrents.pop(hash, None)
         return True
 
     def set_category(self, hashes, category):
         """Set torrent category."""
         self.calls['set_category'].append({'hashes': hashes, 'category': category})
-        for hash in hashes:
-            if hash in self.torrents_data:
-                self.torrents_data[hash]['category'] = category
+        self._set_field(hashes, 'category', category)
         return True
 
     def add_tags(self, hashes, tags):
         """Add tags to torrents."""
         self.calls['add_tags'].append({'hashes': hashes, 'tags': tags})
+        new_tags = self._clean_tags(tags)
+        torrents = self.torrents_data
         for hash in hashes:
-            if hash in self.torrents_data:
-                current = self.torrents_data[hash].get('tags', '')
-                current_list = [t.strip() for t in current.split(',') if t.strip()]
-                # tags is already a list
-                new_tags = [t.strip() for t in tags if t.strip()] if isinstance(tags, list) else [tags.strip()]
-                combined = list(set(current_list + new_tags))
-                self.torrents_data[hash]['tags'] = ','.join(combined)
+            torrent = torrents.get(hash)
+            if torrent is not None:
+                self._store_tags(hash, torrent, self._tags_of(hash, torrent) | new_tags)
         return True
 
     def remove_tags(self, hashes, tags):
         """Remove tags from torrents."""
         self.calls['remove_tags'].append({'hashes': hashes, 'tags': tags})
+        remove_tags = self._clean_tags(tags)
+        torrents = self.torrents_data
         for hash in hashes:
-            if hash in self.torrents_data:
-                current = self.torrents_data[hash].get('tags', '')
-                current_list = [t.strip() for t in current.split(',') if t.strip()]
-                # tags is already a list
-                remove_tags = [t.strip() for t in tags if t.strip()] if isinstance(tags, list) else [tags.strip()]
-                remaining = [t for t in current_list if t not in remove_tags]
-                self.torrents_data[hash]['tags'] = ','.join(remaining)
+            torrent = torrents.get(hash)
+            if torrent is not None:
+                self._store_tags(hash, torrent, self._tags_of(hash, torrent) - remove_tags)
         return True
 
     def set_upload_limit(self, hashes, limit):
         """Set upload limit."""
         self.calls['set_upload_limit'].append({'hashes': hashes, 'limit': limit})
-        for hash in hashes:
-            if hash in self.torrents_data:
-                self.torrents_data[hash]['up_limit'] = limit
+        self._set_field(hashes, 'up_limit', limit)
         return True
 
     def set_download_limit(self, hashes, limit):
         """Set download limit."""
         self.calls['set_download_limit'].append({'hashes': hashes, 'limit': limit})
-        for hash in hashes:
-            if hash in self.torrents_data:
-                self.torrents_data[hash]['dl_limit'] = limit
+        self._set_field(hashes, 'dl_limit', limit)
         return True
 
 
@@ -230,120 +250,156 @@ def mock_api():
 # Torrent Fixtures - Various States
 # ============================================================================
 
+_SAMPLE_TORRENT = {
+    "hash": "abc123def456",
+    "name": "Example.Torrent.1080p",
+    "size": 1073741824,  # 1 GB
+    "progress": 1.0,
+    "dlspeed": 0,
+    "upspeed": 524288,  # 512 KB/s
+    "downloaded": 1073741824,
+    "uploaded": 2147483648,  # 2 GB
+    "ratio": 2.0,
+    "num_complete": 5,
+    "num_incomplete": 2,
+    "num_leechs": 2,
+    "num_seeds": 5,
+    "state": "uploading",
+    "category": "",
+    "tags": "",
+    "added_on": 1700000000,
+    "completion_on": 1700010000,
+    "last_activity": 1700020000,
+    "availability": 1.0,
+    "up_limit": -1,
+    "dl_limit": -1,
+}
+
+
 @pytest.fixture
 def sample_torrent() -> Dict[str, Any]:
     """Basic sample torrent - seeding, good ratio."""
-    return {
-        "hash": "abc123def456",
-        "name": "Example.Torrent.1080p",
-        "size": 1073741824,  # 1 GB
-        "progress": 1.0,
-        "dlspeed": 0,
-        "upspeed": 524288,  # 512 KB/s
-        "downloaded": 1073741824,
-        "uploaded": 2147483648,  # 2 GB
-        "ratio": 2.0,
-        "num_complete": 5,
-        "num_incomplete": 2,
-        "num_leechs": 2,
-        "num_seeds": 5,
-        "state": "uploading",
-        "category": "",
-        "tags": "",
-        "added_on": 1700000000,
-        "completion_on": 1700010000,
-        "last_activity": 1700020000,
-        "availability": 1.0,
-        "up_limit": -1,
-        "dl_limit": -1,
-    }
+    return dict(_SAMPLE_TORRENT)
+
+
+_DOWNLOADING_TORRENT = {
+    "hash": "download123",
+    "name": "Downloading.Movie.2160p",
+    "size": 5368709120,  # 5 GB
+    "progress": 0.45,
+    "dlspeed": 2097152,  # 2 MB/s
+    "upspeed": 0,
+    "downloaded": 2415919104,  # ~2.25 GB
+    "uploaded": 0,
+    "ratio": 0.0,
+    "num_complete": 10,
+    "num_incomplete": 5,
+    "num_leechs": 3,
+    "num_seeds": 10,
+    "state": "downloading",
+    "category": "movies",
+    "tags": "hd,new",
+    "added_on": 1702000000,
+    "completion_on": -1,
+    "last_activity": 1702001000,
+    "availability": 2.5,
+    "up_limit": -1,
+    "dl_limit": -1,
+}
 
 
 @pytest.fixture
 def downloading_torrent() -> Dict[str, Any]:
     """Torrent currently downloading."""
-    return {
-        "hash": "download123",
-        "name": "Downloading.Movie.2160p",
-        "size": 5368709120,  # 5 GB
-        "progress": 0.45,
-        "dlspeed": 2097152,  # 2 MB/s
-        "upspeed": 0,
-        "downloaded": 2415919104,  # ~2.25 GB
-        "uploaded": 0,
-        "ratio": 0.0,
-        "num_complete": 10,
-        "num_incomplete": 5,
-        "num_leechs": 3,
-        "num_seeds": 10,
-        "state": "downloading",
-        "category": "movies",
-        "tags": "hd,new",
-        "added_on": 1702000000,
-        "completion_on": -1,
-        "last_activity": 1702001000,
-        "availability": 2.5,
-        "up_limit": -1,
-        "dl_limit": -1,
-    }
+    return dict(_DOWNLOADING_TORRENT)
+
+
+_SEEDING_TORRENT = {
+    "hash": "seed789",
+    "name": "Popular.Show.S01E01.720p",
+    "size": 2147483648,  # 2 GB
+    "progress": 1.0,
+    "dlspeed": 0,
+    "upspeed": 1048576,  # 1 MB/s
+    "downloaded": 2147483648,
+    "uploaded": 10737418240,  # 10 GB
+    "ratio": 5.0,
+    "num_complete": 50,
+    "num_incomplete": 10,
+    "num_leechs": 8,
+    "num_seeds": 50,
+    "state": "uploading",
+    "category": "tv",
+    "tags": "tv,popular",
+    "added_on": 1701000000,
+    "completion_on": 1701005000,
+    "last_activity": 1702005000,
+    "availability": 1.0,
+    "up_limit": -1,
+    "dl_limit": -1,
+}
 
 
 @pytest.fixture
 def seeding_torrent() -> Dict[str, Any]:
     """Torrent seeding with active upload."""
-    return {
-        "hash": "seed789",
-        "name": "Popular.Show.S01E01.720p",
-        "size": 2147483648,  # 2 GB
-        "progress": 1.0,
-        "dlspeed": 0,
-        "upspeed": 1048576,  # 1 MB/s
-        "downloaded": 2147483648,
-        "uploaded": 10737418240,  # 10 GB
-        "ratio": 5.0,
-        "num_complete": 50,
-        "num_incomplete": 10,
-        "num_leechs": 8,
-        "num_seeds": 50,
-        "state": "uploading",
-        "category": "tv",
-        "tags": "tv,popular",
-        "added_on": 1701000000,
-        "completion_on": 1701005000,
-        "last_activity": 1702005000,
-        "availability": 1.0,
-        "up_limit": -1,
-        "dl_limit": -1,
-    }
+    return dict(_SEEDING_TORRENT)
+
+
+_PAUSED_TORRENT = {
+    "hash": "paused456",
+    "name": "Paused.Torrent",
+    "size": 536870912,  # 512 MB
+    "progress": 1.0,
+    "dlspeed": 0,
+    "upspeed": 0,
+    "downloaded": 536870912,
+    "uploaded": 268435456,  # 256 MB
+    "ratio": 0.5,
+    "num_complete": 3,
+    "num_incomplete": 1,
+    "num_leechs": 1,
+    "num_seeds": 3,
+    "state": "pausedUP",
+    "category": "misc",
+    "tags": "paused",
+    "added_on": 1700500000,
+    "completion_on": 1700510000,
+    "last_activity": 1700520000,
+    "availability": 1.0,
+    "up_limit": -1,
+    "dl_limit": -1,
+}
 
 
 @pytest.fixture
 def paused_torrent() -> Dict[str, Any]:
     """Paused torrent."""
-    return {
-        "hash": "paused456",
-        "name": "Paused.Torrent",
-        "size": 536870912,  # 512 MB
-        "progress": 1.0,
-        "dlspeed": 0,
-        "upspeed": 0,
-        "downloaded": 536870912,
-        "uploaded": 268435456,  # 256 MB
-        "ratio": 0.5,
-        "num_complete": 3,
-        "num_incomplete": 1,
-        "num_leechs": 1,
-        "num_seeds": 3,
-        "state": "pausedUP",
-        "category": "misc",
-        "tags": "paused",
-        "added_on": 1700500000,
-        "completion_on": 1700510000,
-        "last_activity": 1700520000,
-        "availability": 1.0,
-        "up_limit": -1,
-        "dl_limit": -1,
-    }
+    return dict(_PAUSED_TORRENT)
+
+
+# Static part of completed_torrent; time-relative fields are filled in per test
+_COMPLETED_TORRENT_BASE = {
+    "hash": "completed999",
+    "name": "Just.Completed.1080p",
+    "size": 3221225472,  # 3 GB
+    "progress": 1.0,
+    "dlspeed": 0,
+    "upspeed": 262144,  # 256 KB/s
+    "downloaded": 3221225472,
+    "uploaded": 322122547,  # ~307 MB
+    "ratio": 0.1,
+    "num_complete": 8,
+    "num_incomplete": 4,
+    "num_leechs": 4,
+    "num_seeds": 8,
+    "state": "uploading",
+    "category": "movies",
+    "tags": "new,completed",
+    "availability": 1.0,
+    "up_limit": -1,
+    "dl_limit": -1,
+}
 
 
 @pytest.fixture
@@ -352,118 +408,112 @@ def completed_torrent() -> Dict[str, Any]:
     import time
     now = int(time.time())
     return {
-        "hash": "completed999",
-        "name": "Just.Completed.1080p",
-        "size": 3221225472,  # 3 GB
-        "progress": 1.0,
-        "dlspeed": 0,
-        "upspeed": 262144,  # 256 KB/s
-        "downloaded": 3221225472,
-        "uploaded": 322122547,  # ~307 MB
-        "ratio": 0.1,
-        "num_complete": 8,
-        "num_incomplete": 4,
-        "num_leechs": 4,
-        "num_seeds": 8,
-        "state": "uploading",
-        "category": "movies",
-        "tags": "new,completed",
+        **_COMPLETED_TORRENT_BASE,
         "added_on": now - 7200,  # 2 hours ago
         "completion_on": now - 300,  # 5 minutes ago
         "last_activity": now - 60,  # 1 minute ago
-        "availability": 1.0,
-        "up_limit": -1,
-        "dl_limit": -1,
     }
 
 
+# Static part of old_seeded_torrent; time-relative fields are filled in per test
+_OLD_SEEDED_TORRENT_BASE = {
+    "hash": "oldseeder",
+    "name": "Old.Torrent.2020",
+    "size": 1073741824,  # 1 GB
+    "progress": 1.0,
+    "dlspeed": 0,
+    "upspeed": 0,
+    "downloaded": 1073741824,
+    "uploaded": 5368709120,  # 5 GB
+    "ratio": 5.0,
+    "num_complete": 2,
+    "num_incomplete": 0,
+    "num_leechs": 0,
+    "num_seeds": 2,
+    "state": "stalledUP",
+    "category": "old",
+    "tags": "archived,old",
+    "availability": 1.0,
+    "up_limit": -1,
+    "dl_limit": -1,
+}
+
+
 @pytest.fixture
 def old_seeded_torrent() -> Dict[str, Any]:
     """Old torrent that has been seeding for a long time."""
     import time
     now = int(time.time())
     return {
-        "hash": "oldseeder",
-        "name": "Old.Torrent.2020",
-        "size": 1073741824,  # 1 GB
-        "progress": 1.0,
-        "dlspeed": 0,
-        "upspeed": 0,
-        "downloaded": 1073741824,
-        "uploaded": 5368709120,  # 5 GB
-        "ratio": 5.0,
-        "num_complete": 2,
-        "num_incomplete": 0,
-        "num_leechs": 0,
-        "num_seeds": 2,
-        "state": "stalledUP",
-        "category": "old",
-        "tags": "archived,old",
+        **_OLD_SEEDED_TORRENT_BASE,
         "added_on": now - 7776000,  # 90 days ago
         "completion_on": now - 7776000 + 3600,  # Completed 90 days ago
         "last_activity": now - 86400,  # Last active 1 day ago
-        "availability": 1.0,
-        "up_limit": -1,
-        "dl_limit": -1,
     }
 
 
+_LARGE_TORRENT = {
+    "hash": "largetorrent",
+    "name": "Huge.Collection.4K.UHD",
+    "size": 107374182400,  # 100 GB
+    "progress": 0.15,
+    "dlspeed": 5242880,  # 5 MB/s
+    "upspeed": 0,
+    "downloaded": 16106127360,  # ~15 GB
+    "uploaded": 0,
+    "ratio": 0.0,
+    "num_complete": 5,
+    "num_incomplete": 20,
+    "num_leechs": 15,
+    "num_seeds": 5,
+    "state": "downloading",
+    "category": "large",
+    "tags": "4k,uhd,large",
+    "added_on": 1702000000,
+    "completion_on": -1,
+    "last_activity": 1702001000,
+    "availability": 0.8,
+    "up_limit": -1,
+    "dl_limit": -1,
+}
+
+
 @pytest.fixture
 def large_torrent() -> Dict[str, Any]:
     """Very large torrent (100 GB)."""
-    return {
-        "hash": "largetorrent",
-        "name": "Huge.Collection.4K.UHD",
-        "size": 107374182400,  # 100 GB
-        "progress": 0.15,
-        "dlspeed": 5242880,  # 5 MB/s
-        "upspeed": 0,
-        "downloaded": 16106127360,  # ~15 GB
-        "uploaded": 0,
-        "ratio": 0.0,
-        "num_complete": 5,
-        "num_incomplete": 20,
-        "num_leechs": 15,
-        "num_seeds": 5,
-        "state": "downloading",
-        "category": "large",
-        "tags": "4k,uhd,large",
-        "added_on": 1702000000,
-        "completion_on": -1,
-        "last_activity": 1702001000,
-        "availability": 0.8,
-        "up_limit": -1,
-        "dl_limit": -1,
-    }
+    return dict(_LARGE_TORRENT)
+
+
+_SMALL_TORRENT = {
+    "hash": "smalltorrent",
+    "name": "Small.File.pdf",
+    "size": 10485760,  # 10 MB
+    "progress": 1.0,
+    "dlspeed": 0,
+    "upspeed": 10240,  # 10 KB/s
+    "downloaded": 10485760,
+    "uploaded": 52428800,  # 50 MB
+    "ratio": 5.0,
+    "num_complete": 100,
+    "num_incomplete": 5,
+    "num_leechs": 5,
+    "num_seeds": 100,
+    "state": "uploading",
+    "category": "docs",
+    "tags": "small,document",
+    "added_on": 1701000000,
+    "completion_on": 1701000100,
+    "last_activity": 1702000000,
+    "availability": 1.0,
+    "up_limit": -1,
+    "dl_limit": -1,
+}
 
 
 @pytest.fixture
 def small_torrent() -> Dict[str, Any]:
     """Very small torrent (10 MB)."""
-    return {
-        "hash": "smalltorrent",
-        "name": "Small.File.pdf",
-        "size": 10485760,  # 10 MB
-        "progress": 1.0,
-        "dlspeed": 0,
-        "upspeed": 10240,  # 10 KB/s
-        "downloaded": 10485760,
-        "uploaded": 52428800,  # 50 MB
-        "ratio": 5.0,
-        "num_complete": 100,
-        "num_incomplete": 5,
-        "num_leechs": 5,
-        "num_seeds": 100,
-        "state": "uploading",
-        "category": "docs",
-        "tags": "small,document",
-        "added_on": 1701000000,
-        "completion_on": 1701000100,
-        "last_activity": 1702000000,
-        "availability": 1.0,
-        "up_limit": -1,
-        "dl_limit": -1,
-    }
+    return dict(_SMALL_TORRENT)
 
 
 # ============================================================================
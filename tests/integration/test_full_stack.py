@@ -13,7 +13,9 @@ import pytest
 import time
 import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 from qbt_rules.server import create_app
@@ -22,6 +24,9 @@ from qbt_rules.queue_manager import create_queue, JobStatus
 from qbt_rules.__version__ import __version__
 
 
+API_KEY = 'test-integration-key-12345'
+
+
 @pytest.fixture
 def temp_db_path(tmp_path):
     """Create temporary SQLite database path"""
@@ -51,16 +56,15 @@ def mock_engine(mocker):
     """Create mock RulesEngine"""
     engine = mocker.MagicMock()
 
-    # Mock stats
-    stats = mocker.MagicMock()
-    stats.total_torrents = 10
-    stats.processed = 8
-    stats.rules_matched = 5
-    stats.actions_executed = 3
-    stats.actions_skipped = 2
-    stats.errors = 0
-
-    engine.stats = stats
+    # Plain stats values - the worker copies these into the JSON job result
+    engine.stats = SimpleNamespace(
+        total_torrents=10,
+        processed=8,
+        rules_matched=5,
+        actions_executed=3,
+        actions_skipped=2,
+        errors=0,
+    )
     engine.run.return_value = None
 
     return engine
@@ -82,16 +86,15 @@ def queue_backend(request, temp_db_path):
 
 
 @pytest.fixture
-def worker_instance(queue_backend, mock_api, mock_config, mock_engine, mocker):
+def worker_instance(queue_backend, mock_api, mock_config, mock_engine):
     """Create worker instance with mocked engine"""
-    # Mock RulesEngine to avoid actual qBittorrent calls
-    mocker.patch('qbt_rules.worker.RulesEngine', return_value=mock_engine)
-
     worker = Worker(
         queue=queue_backend,
         api=mock_api,
         config=mock_config,
-        poll_interval=0.01  # Fast polling for tests
+        poll_interval=0.01,  # Fast polling for tests
+        # Inject the mock engine to avoid actual qBittorrent calls
+        engine_factory=lambda **kwargs: mock_engine
     )
 
     yield worker
@@ -104,8 +107,7 @@ def worker_instance(queue_backend, mock_api, mock_config, mock_engine, mocker):
 @pytest.fixture
 def app(queue_backend, worker_instance):
     """Create Flask app with real queue and worker"""
-    api_key = 'test-integration-key-12345'
-    app = create_app(queue_backend, worker_instance, api_key)
+    app = create_app(queue_backend, worker_instance, API_KEY)
     app.config['TESTING'] = True
     return app
 
@@ -116,10 +118,40 @@ def client(app):
     return app.test_client()
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def auth_headers():
-    """Authentication headers"""
-    return {'X-API-Key': 'test-integration-key-12345'}
+    """Authentication headers (read-only, shared by every test)"""
+    return MappingProxyType({'X-API-Key': API_KEY})
+
+
+@pytest.fixture(scope='module')
+def executor():
+    """Thread pool shared by the concurrency tests"""
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        yield pool
+
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+def wait_for_job(client, headers, job_id, timeout=5.0, interval=0.01):
+    """Poll a job until it finishes (or timeout expires) and return it"""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f'/api/jobs/{job_id}', headers=headers).json
+        if job['status'] in FINISHED_STATUSES or time.monotonic() >= deadline:
+            return job
+        time.sleep(interval)
+
+
+def wait_for_jobs(client, headers, job_ids, timeout=5.0):
+    """Wait for each job in turn and return them in the same order"""
+    return [wait_for_job(client, headers, job_id, timeout) for job_id in job_ids]
+
+
+def post_jobs(client, headers, urls):
+    """POST each execute URL and return the queued job IDs"""
+    return [client.post(url, headers=headers).json['job_id'] for url in urls]
 
 
 class TestFullJobLifecycle:
@@ -138,7 +170,7 @@ class TestFullJobLifecycle:
         job_id = data['job_id']
 
         # Wait for job to be processed
-        time.sleep(0.5)
+        wait_for_job(client, auth_headers, job_id)
 
         # Check job status via API
         response = client.get(f'/api/jobs/{job_id}', headers=auth_headers)
@@ -162,12 +194,9 @@ class TestFullJobLifecycle:
         job_id = response.json['job_id']
 
         # Wait for processing
-        time.sleep(0.5)
+        job = wait_for_job(client, auth_headers, job_id)
 
         # Verify job completed
-        response = client.get(f'/api/jobs/{job_id}', headers=auth_headers)
-        job = response.json
-
         assert job['status'] == JobStatus.COMPLETED
         assert job['hash'] == 'abc123'
 
@@ -184,13 +213,8 @@ class TestFullJobLifecycle:
             assert response.status_code == 202
             job_ids.append(response.json['job_id'])
 
-        # Wait for all to complete
-        time.sleep(1.0)
-
-        # Verify all completed
-        for job_id in job_ids:
-            response = client.get(f'/api/jobs/{job_id}', headers=auth_headers)
-            job = response.json
+        # Wait for all to complete, then verify
+        for job in wait_for_jobs(client, auth_headers, job_ids):
             assert job['status'] == JobStatus.COMPLETED
 
         worker_instance.stop()
@@ -202,10 +226,7 @@ class TestFullJobLifecycle:
         response = client.post('/api/execute', headers=auth_headers)
         job_id = response.json['job_id']
 
-        time.sleep(0.5)
-
-        response = client.get(f'/api/jobs/{job_id}', headers=auth_headers)
-        job = response.json
+        job = wait_for_job(client, auth_headers, job_id)
 
         assert 'result' in job
         result = job['result']
@@ -229,10 +250,7 @@ class TestJobFailureHandling:
         response = client.post('/api/execute', headers=auth_headers)
         job_id = response.json['job_id']
 
-        time.sleep(0.5)
-
-        response = client.get(f'/api/jobs/{job_id}', headers=auth_headers)
-        job = response.json
+        job = wait_for_job(client, auth_headers, job_id)
 
         assert job['status'] == JobStatus.FAILED
         assert 'error' in job
@@ -254,14 +272,12 @@ class TestJobFailureHandling:
         response2 = client.post('/api/execute', headers=auth_headers)
         job2_id = response2.json['job_id']
 
-        time.sleep(0.8)
+        job1, job2 = wait_for_jobs(client, auth_headers, [job1_id, job2_id])
 
         # First job failed
-        job1 = client.get(f'/api/jobs/{job1_id}', headers=auth_headers).json
         assert job1['status'] == JobStatus.FAILED
 
         # Second job completed
-        job2 = client.get(f'/api/jobs/{job2_id}', headers=auth_headers).json
         assert job2['status'] == JobStatus.COMPLETED
 
         worker_instance.stop()
@@ -317,10 +333,9 @@ class TestListAndFilterJobs:
         worker_instance.start()
 
         # Create multiple jobs
-        for i in range(3):
-            client.post(f'/api/execute?context=test-{i}', headers=auth_headers)
+        job_ids = post_jobs(client, auth_headers, [f'/api/execute?context=test-{i}' for i in range(3)])
 
-        time.sleep(0.8)
+        wait_for_jobs(client, auth_headers, job_ids)
 
         # List all jobs
         response = client.get('/api/jobs', headers=auth_headers)
@@ -337,10 +352,9 @@ class TestListAndFilterJobs:
         worker_instance.start()
 
         # Create jobs
-        client.post('/api/execute', headers=auth_headers)
-        client.post('/api/execute', headers=auth_headers)
+        job_ids = post_jobs(client, auth_headers, ['/api/execute'] * 2)
 
-        time.sleep(0.8)
+        wait_for_jobs(client, auth_headers, job_ids)
 
         # Filter by completed
         response = client.get('/api/jobs?status=completed', headers=auth_headers)
@@ -357,10 +371,12 @@ class TestListAndFilterJobs:
         worker_instance.start()
 
         # Create jobs with different contexts
-        client.post('/api/execute?context=weekly-cleanup', headers=auth_headers)
-        client.post('/api/execute?context=torrent-imported', headers=auth_headers)
+        job_ids = post_jobs(client, auth_headers, [
+            '/api/execute?context=weekly-cleanup',
+            '/api/execute?context=torrent-imported',
+        ])
 
-        time.sleep(0.8)
+        wait_for_jobs(client, auth_headers, job_ids)
 
         # Filter by context
         response = client.get('/api/jobs?context=weekly-cleanup', headers=auth_headers)
@@ -377,10 +393,9 @@ class TestListAndFilterJobs:
         worker_instance.start()
 
         # Create multiple jobs
-        for i in range(5):
-            client.post('/api/execute', headers=auth_headers)
+        job_ids = post_jobs(client, auth_headers, ['/api/execute'] * 5)
 
-        time.sleep(1.0)
+        wait_for_jobs(client, auth_headers, job_ids)
 
         # Get first page
         response = client.get('/api/jobs?limit=2&offset=0', headers=auth_headers)
@@ -459,10 +474,9 @@ class TestStatistics:
         worker_instance.start()
 
         # Create some jobs
-        client.post('/api/execute', headers=auth_headers)
-        client.post('/api/execute', headers=auth_headers)
+        job_ids = post_jobs(client, auth_headers, ['/api/execute'] * 2)
 
-        time.sleep(0.8)
+        wait_for_jobs(client, auth_headers, job_ids)
 
         response = client.get('/api/stats', headers=auth_headers)
         assert response.status_code == 200
@@ -482,8 +496,8 @@ class TestStatistics:
         worker_instance.start()
 
         # Process jobs
-        client.post('/api/execute', headers=auth_headers)
-        time.sleep(0.5)
+        job_ids = post_jobs(client, auth_headers, ['/api/execute'])
+        wait_for_jobs(client, auth_headers, job_ids)
 
         response = client.get('/api/stats', headers=auth_headers)
         data = response.json
@@ -548,24 +562,14 @@ class TestWorkerGracefulShutdown:
 class TestConcurrentOperations:
     """Test concurrent API operations"""
 
-    def test_concurrent_job_submission(self, client, auth_headers, worker_instance):
+    def test_concurrent_job_submission(self, client, auth_headers, worker_instance, executor):
         """Should handle concurrent job submissions"""
-        import threading
-
         worker_instance.start()
 
-        responses = []
-
-        def submit_job():
-            response = client.post('/api/execute', headers=auth_headers)
-            responses.append(response)
-
         # Submit 5 jobs concurrently
-        threads = [threading.Thread(target=submit_job) for _ in range(5)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        responses = list(executor.map(
+            lambda _: client.post('/api/execute', headers=auth_headers), range(5)
+        ))
 
         # All should succeed
         assert len(responses) == 5
@@ -578,30 +582,20 @@ class TestConcurrentOperations:
 
         worker_instance.stop()
 
-    def test_concurrent_job_queries(self, client, auth_headers, worker_instance):
+    def test_concurrent_job_queries(self, client, auth_headers, worker_instance, executor):
         """Should handle concurrent job status queries"""
-        import threading
-
         worker_instance.start()
 
         # Create a job
         response = client.post('/api/execute', headers=auth_headers)
         job_id = response.json['job_id']
 
-        time.sleep(0.5)  # Let it complete
-
-        responses = []
-
-        def query_job():
-            response = client.get(f'/api/jobs/{job_id}', headers=auth_headers)
-            responses.append(response)
+        wait_for_job(client, auth_headers, job_id)  # Let it complete
 
         # Query concurrently
-        threads = [threading.Thread(target=query_job) for _ in range(10)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        responses = list(executor.map(
+            lambda _: client.get(f'/api/jobs/{job_id}', headers=auth_headers), range(10)
+        ))
 
         # All should succeed
         assert len(responses) == 10
@@ -614,30 +608,22 @@ class TestConcurrentOperations:
 class TestQueueBackendSwitching:
     """Test that system works with different queue backends"""
 
-    def test_sqlite_backend_integration(self, temp_db_path, mock_api, mock_config, mock_engine, mocker):
+    @pytest.mark.parametrize('queue_backend', ['sqlite'], indirect=True)
+    def test_sqlite_backend_integration(self, client, auth_headers, worker_instance, queue_backend):
         """Should work correctly with SQLite backend"""
-        mocker.patch('qbt_rules.worker.RulesEngine', return_value=mock_engine)
-
-        # Create SQLite queue
-        queue = create_queue('sqlite', db_path=temp_db_path)
-        worker = Worker(queue, mock_api, mock_config, poll_interval=0.01)
-        app = create_app(queue, worker, 'test-key')
-        client = app.test_client()
+        assert type(queue_backend).__name__ == 'SQLiteQueue'
 
-        worker.start()
+        worker_instance.start()
 
         # Test basic operation
-        response = client.post('/api/execute', headers={'X-API-Key': 'test-key'})
+        response = client.post('/api/execute', headers=auth_headers)
         assert response.status_code == 202
 
-        time.sleep(0.5)
-
         job_id = response.json['job_id']
-        job = client.get(f'/api/jobs/{job_id}', headers={'X-API-Key': 'test-key'}).json
+        job = wait_for_job(client, auth_headers, job_id)
         assert job['status'] == JobStatus.COMPLETED
 
-        worker.stop()
-        queue.close()
+        worker_instance.stop()
 
 
 class TestErrorHandling:
@@ -1,180 +1,241 @@
 """End-to-end tests simulating real-world resolver usage"""
 
+import os
 import pytest
-import tempfile
 import yaml
-from pathlib import Path
 
 from qbt_rules.config import Config
-from qbt_rules.engine import RulesEngine
+from qbt_rules.errors import InvalidRefError, UnknownRefError, UnknownVariableError
 
+# Mirror the loader in qbt_rules.config: libyaml emitter when available
+Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
 
-class TestResolverRealWorldScenarios:
-    """Test real-world usage scenarios with actual Config and Engine"""
 
-    def test_complete_workflow_with_resolver(self, tmp_path):
-        """Test complete workflow: Config → Resolver → Engine"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        # Create realistic config
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
+def bump_mtime(path):
+    """Advance a file's mtime by one second so reload checks see a change"""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
 
-        # Create realistic rules with resolver
-        rules_content = {
-            'refs': {
-                'vars': {
-                    'min_ratio': 1.5,
-                    'high_ratio': 3.0,
-                    'cleanup_age': '30 days',
-                    'protected_categories': ['keep', 'seedbox', 'long-term'],
-                    'hd_pattern': '(?i).*(1080p|2160p|4k).*',
-                },
-                'conditions': {
-                    'private-tracker': {
-                        'any': [
-                            {'field': 'trackers.url', 'operator': 'contains', 'value': 'privatehd.to'},
-                            {'field': 'trackers.url', 'operator': 'contains', 'value': 'torrentleech.org'},
-                            {'field': 'trackers.url', 'operator': 'contains', 'value': 'iptorrents.com'}
-                        ]
-                    },
-                    'well-seeded': {
-                        'all': [
-                            {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.min_ratio}'},
-                            {'field': 'info.completion_on', 'operator': 'older_than', 'value': '${vars.cleanup_age}'}
-                        ]
-                    },
-                    'highly-seeded': {
-                        'all': [
-                            {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.high_ratio}'},
-                            {'field': 'info.seeding_time', 'operator': '>', 'value': 604800}
-                        ]
-                    },
-                    'hd-content': {
-                        'all': [
-                            {'field': 'info.name', 'operator': 'matches', 'value': '${vars.hd_pattern}'}
-                        ]
-                    },
-                    'protected': {
-                        'any': [
-                            {'field': 'info.category', 'operator': 'in', 'value': '${vars.protected_categories}'},
-                            {'field': 'info.tags', 'operator': 'contains', 'value': 'keep'}
-                        ]
-                    },
-                    'no-activity': {
-                        'all': [
-                            {'field': 'info.num_leechs', 'operator': '==', 'value': 0},
-                            {'field': 'info.num_seeds', 'operator': '<=', 'value': 2}
-                        ]
-                    }
-                },
-                'actions': {
-                    'safe-delete': [
-                        {'type': 'add_tag', 'params': {'tags': ['pending-delete']}},
-                        {'type': 'stop'}
-                    ],
-                    'force-seed': [
-                        {'type': 'force_start'},
-                        {'type': 'add_tag', 'params': {'tags': ['force-seeding']}}
-                    ],
-                    'tag-hd-content': [
-                        {'type': 'add_tag', 'params': {'tags': ['hd', 'quality']}},
-                        {'type': 'set_category', 'params': {'category': 'hd-content'}}
-                    ],
-                    'pause-low-activity': [
-                        {'type': 'stop'},
-                        {'type': 'add_tag', 'params': {'tags': ['paused-low-activity']}}
-                    ]
-                }
+
+def make_config(config_dir, rules_content):
+    """Write rules.yml into config_dir and return a Config loading it"""
+    (config_dir / 'rules.yml').write_text(yaml.dump(rules_content, Dumper=Dumper))
+    return Config(config_dir=config_dir)
+
+
+@pytest.fixture(scope='module')
+def base_config_file(tmp_path_factory):
+    """Write the shared config.yml once for every test in the module"""
+    config_content = {
+        'qbittorrent': {
+            'host': 'http://localhost:8080',
+            'username': 'admin',
+            'password': 'adminpass'
+        }
+    }
+    config_file = tmp_path_factory.mktemp('base-config') / 'config.yml'
+    config_file.write_text(yaml.dump(config_content, Dumper=Dumper))
+    return config_file
+
+
+@pytest.fixture
+def config_dir(tmp_path, base_config_file):
+    """Per-test config directory linking the shared config.yml"""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / 'config.yml').symlink_to(base_config_file)
+    return config_dir
+
+
+# Static rule sets - only ever dumped to YAML, never mutated
+COMPLETE_WORKFLOW_RULES = {
+    'refs': {
+        'vars': {
+            'min_ratio': 1.5,
+            'high_ratio': 3.0,
+            'cleanup_age': '30 days',
+            'protected_categories': ['keep', 'seedbox', 'long-term'],
+            'hd_pattern': '(?i).*(1080p|2160p|4k).*',
+        },
+        'conditions': {
+            'private-tracker': {
+                'any': [
+                    {'field': 'trackers.url', 'operator': 'contains', 'value': 'privatehd.to'},
+                    {'field': 'trackers.url', 'operator': 'contains', 'value': 'torrentleech.org'},
+                    {'field': 'trackers.url', 'operator': 'contains', 'value': 'iptorrents.com'}
+                ]
             },
-            'rules': [
-                {
-                    'name': 'Cleanup well-seeded private tracker torrents',
-                    'enabled': True,
-                    'priority': 50,
-                    'context': 'weekly-cleanup',
-                    'conditions': [
-                        {'$ref': 'conditions.private-tracker'},
-                        {'$ref': 'conditions.well-seeded'},
-                        {'none': [{'$ref': 'conditions.protected'}]}
-                    ],
-                    'actions': [
-                        {'$ref': 'actions.safe-delete'}
-                    ]
-                },
-                {
-                    'name': 'Force seed private tracker under ratio',
-                    'enabled': True,
-                    'priority': 100,
-                    'context': 'download-finished',
-                    'conditions': [
-                        {'$ref': 'conditions.private-tracker'},
-                        {'all': [
-                            {'field': 'info.ratio', 'operator': '<', 'value': '${vars.min_ratio}'}
-                        ]}
-                    ],
-                    'actions': [
-                        {'$ref': 'actions.force-seed'}
-                    ]
-                },
-                {
-                    'name': 'Tag HD content from private trackers',
-                    'enabled': True,
-                    'priority': 75,
-                    'context': 'torrent-imported',
-                    'conditions': [
-                        {'$ref': 'conditions.private-tracker'},
-                        {'$ref': 'conditions.hd-content'}
-                    ],
-                    'actions': [
-                        {'$ref': 'actions.tag-hd-content'}
-                    ]
-                },
-                {
-                    'name': 'Pause highly seeded torrents with no activity',
-                    'enabled': True,
-                    'priority': 25,
-                    'conditions': [
-                        {'$ref': 'conditions.highly-seeded'},
-                        {'$ref': 'conditions.no-activity'},
-                        {'none': [{'$ref': 'conditions.protected'}]}
-                    ],
-                    'actions': [
-                        {'$ref': 'actions.pause-low-activity'}
-                    ]
-                },
-                {
-                    'name': 'Mixed rule with refs and inline conditions',
-                    'enabled': True,
-                    'priority': 60,
-                    'conditions': [
-                        {'$ref': 'conditions.private-tracker'},
-                        {'all': [
-                            {'field': 'info.size', 'operator': '>', 'value': 10737418240},
-                            {'field': 'info.state', 'operator': '==', 'value': 'uploading'}
-                        ]},
-                        {'$ref': 'conditions.hd-content'}
-                    ],
-                    'actions': [
-                        {'type': 'add_tag', 'params': {'tags': ['large-hd-upload']}},
-                        {'$ref': 'actions.force-seed'}
-                    ]
-                }
+            'well-seeded': {
+                'all': [
+                    {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.min_ratio}'},
+                    {'field': 'info.completion_on', 'operator': 'older_than', 'value': '${vars.cleanup_age}'}
+                ]
+            },
+            'highly-seeded': {
+                'all': [
+                    {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.high_ratio}'},
+                    {'field': 'info.seeding_time', 'operator': '>', 'value': 604800}
+                ]
+            },
+            'hd-content': {
+                'all': [
+                    {'field': 'info.name', 'operator': 'matches', 'value': '${vars.hd_pattern}'}
+                ]
+            },
+            'protected': {
+                'any': [
+                    {'field': 'info.category', 'operator': 'in', 'value': '${vars.protected_categories}'},
+                    {'field': 'info.tags', 'operator': 'contains', 'value': 'keep'}
+                ]
+            },
+            'no-activity': {
+                'all': [
+                    {'field': 'info.num_leechs', 'operator': '==', 'value': 0},
+                    {'field': 'info.num_seeds', 'operator': '<=', 'value': 2}
+                ]
+            }
+        },
+        'actions': {
+            'safe-delete': [
+                {'type': 'add_tag', 'params': {'tags': ['pending-delete']}},
+                {'type': 'stop'}
+            ],
+            'force-seed': [
+                {'type': 'force_start'},
+                {'type': 'add_tag', 'params': {'tags': ['force-seeding']}}
+            ],
+            'tag-hd-content': [
+                {'type': 'add_tag', 'params': {'tags': ['hd', 'quality']}},
+                {'type': 'set_category', 'params': {'category': 'hd-content'}}
+            ],
+            'pause-low-activity': [
+                {'type': 'stop'},
+                {'type': 'add_tag', 'params': {'tags': ['paused-low-activity']}}
+            ]
+        }
+    },
+    'rules': [
+        {
+            'name': 'Cleanup well-seeded private tracker torrents',
+            'enabled': True,
+            'priority': 50,
+            'context': 'weekly-cleanup',
+            'conditions': [
+                {'$ref': 'conditions.private-tracker'},
+                {'$ref': 'conditions.well-seeded'},
+                {'none': [{'$ref': 'conditions.protected'}]}
+            ],
+            'actions': [
+                {'$ref': 'actions.safe-delete'}
+            ]
+        },
+        {
+            'name': 'Force seed private tracker under ratio',
+            'enabled': True,
+            'priority': 100,
+            'context': 'download-finished',
+            'conditions': [
+                {'$ref': 'conditions.private-tracker'},
+                {'all': [
+                    {'field': 'info.ratio', 'operator': '<', 'value': '${vars.min_ratio}'}
+                ]}
+            ],
+            'actions': [
+                {'$ref': 'actions.force-seed'}
+            ]
+        },
+        {
+            'name': 'Tag HD content from private trackers',
+            'enabled': True,
+            'priority': 75,
+            'context': 'torrent-imported',
+            'conditions': [
+                {'$ref': 'conditions.private-tracker'},
+                {'$ref': 'conditions.hd-content'}
+            ],
+            'actions': [
+                {'$ref': 'actions.tag-hd-content'}
+            ]
+        },
+        {
+            'name': 'Pause highly seeded torrents with no activity',
+            'enabled': True,
+            'priority': 25,
+            'conditions': [
+                {'$ref': 'conditions.highly-seeded'},
+                {'$ref': 'conditions.no-activity'},
+                {'none': [{'$ref': 'conditions.protected'}]}
+            ],
+            'actions': [
+                {'$ref': 'actions.pause-low-activity'}
             ]
+        },
+        {
+            'name': 'Mixed rule with refs and inline conditions',
+            'enabled': True,
+            'priority': 60,
+            'conditions': [
+                {'$ref': 'conditions.private-tracker'},
+                {'all': [
+                    {'field': 'info.size', 'operator': '>', 'value': 10737418240},
+                    {'field': 'info.state', 'operator': '==', 'value': 'uploading'}
+                ]},
+                {'$ref': 'conditions.hd-content'}
+            ],
+            'actions': [
+                {'type': 'add_tag', 'params': {'tags': ['large-hd-upload']}},
+                {'$ref': 'actions.force-seed'}
+            ]
+        }
+    ]
+}
+
+
+ALL_TYPES_RULES = {
+    'refs': {
+        'vars': {
+            # Different types
+            'ratio_float': 1.5,
+            'ratio_int': 2,
+            'size_bytes': 10737418240,
+            'age_string': '30 days',
+            'category_list': ['movies', 'tv', 'music'],
+            'enabled_bool': True,
+            'disabled_bool': False,
+            'null_value': None,
+            'empty_string': '',
+            'pattern': '(?i).*(s\\d{2}e\\d{2}).*',
+            'config_dict': {'timeout': 30, 'retries': 3}
         }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
+    },
+    'rules': [
+        {
+            'name': 'Test all types',
+            'enabled': True,
+            'conditions': [
+                {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.ratio_float}'},
+                {'field': 'info.ratio', 'operator': '<', 'value': '${vars.ratio_int}'},
+                {'field': 'info.size', 'operator': '>', 'value': '${vars.size_bytes}'},
+                {'field': 'info.added_on', 'operator': 'older_than', 'value': '${vars.age_string}'},
+                {'field': 'info.category', 'operator': 'in', 'value': '${vars.category_list}'},
+                {'field': 'info.name', 'operator': 'matches', 'value': '${vars.pattern}'},
+            ],
+            'actions': []
+        }
+    ]
+}
+
+
+class TestResolverRealWorldScenarios:
+    """Test real-world usage scenarios with actual Config and Engine"""
+
+    def test_complete_workflow_with_resolver(self, config_dir):
+        """Test complete workflow: Config → Resolver → Engine"""
+        # Create realistic rules with resolver
+        rules_content = COMPLETE_WORKFLOW_RULES
 
         # Load config
-        config = Config(config_dir=config_dir)
+        config = make_config(config_dir, rules_content)
 
         # Get resolved rules
         resolved_rules = config.get_rules(resolved=True)
@@ -230,96 +291,33 @@ class TestResolverRealWorldScenarios:
 
         # Verify raw rules still have $ref and ${vars.*}
         raw_rules = config.get_rules(resolved=False)
-        assert '$ref' in str(raw_rules[0])
-        assert '${vars.min_ratio}' in str(raw_rules[1])
+        assert raw_rules[0]['conditions'][0] == {'$ref': 'conditions.private-tracker'}
+        assert raw_rules[1]['conditions'][1]['all'][0]['value'] == '${vars.min_ratio}'
 
-    def test_resolver_with_multiple_variable_types(self, tmp_path):
+    def test_resolver_with_multiple_variable_types(self, config_dir):
         """Test all variable types in realistic scenario"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
-
-        rules_content = {
-            'refs': {
-                'vars': {
-                    # Different types
-                    'ratio_float': 1.5,
-                    'ratio_int': 2,
-                    'size_bytes': 10737418240,
-                    'age_string': '30 days',
-                    'category_list': ['movies', 'tv', 'music'],
-                    'enabled_bool': True,
-                    'disabled_bool': False,
-                    'null_value': None,
-                    'empty_string': '',
-                    'pattern': '(?i).*(s\\d{2}e\\d{2}).*',
-                    'config_dict': {'timeout': 30, 'retries': 3}
-                }
-            },
-            'rules': [
-                {
-                    'name': 'Test all types',
-                    'enabled': True,
-                    'conditions': [
-                        {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.ratio_float}'},
-                        {'field': 'info.ratio', 'operator': '<', 'value': '${vars.ratio_int}'},
-                        {'field': 'info.size', 'operator': '>', 'value': '${vars.size_bytes}'},
-                        {'field': 'info.added_on', 'operator': 'older_than', 'value': '${vars.age_string}'},
-                        {'field': 'info.category', 'operator': 'in', 'value': '${vars.category_list}'},
-                        {'field': 'info.name', 'operator': 'matches', 'value': '${vars.pattern}'},
-                    ],
-                    'actions': []
-                }
-            ]
-        }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
-
-        config = Config(config_dir=config_dir)
-        resolved = config.get_rules()[0]
+        rules_content = ALL_TYPES_RULES
+        config = make_config(config_dir, rules_content)
+        rules = config.get_rules()
+        assert config.get_rules() is rules  # Resolved once, then served from cache
+        conditions = rules[0]['conditions']
 
         # Verify types are preserved
-        assert resolved['conditions'][0]['value'] == 1.5
-        assert type(resolved['conditions'][0]['value']) == float
-
-        assert resolved['conditions'][1]['value'] == 2
-        assert type(resolved['conditions'][1]['value']) == int
-
-        assert resolved['conditions'][2]['value'] == 10737418240
-        assert type(resolved['conditions'][2]['value']) == int
-
-        assert resolved['conditions'][3]['value'] == '30 days'
-        assert type(resolved['conditions'][3]['value']) == str
-
-        assert resolved['conditions'][4]['value'] == ['movies', 'tv', 'music']
-        assert type(resolved['conditions'][4]['value']) == list
-
-        assert '(?i)' in resolved['conditions'][5]['value']
-
-    def test_resolver_caching_behavior(self, tmp_path):
+        expected = [
+            (1.5, float),
+            (2, int),
+            (10737418240, int),
+            ('30 days', str),
+            (['movies', 'tv', 'music'], list),
+        ]
+        for condition, (value, value_type) in zip(conditions, expected):
+            assert condition['value'] == value
+            assert type(condition['value']) is value_type
+
+        assert '(?i)' in conditions[5]['value']
+
+    def test_resolver_caching_behavior(self, config_dir):
         """Test that resolved rules are cached correctly"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
-
         rules_file = config_dir / 'rules.yml'
         rules_content = {
             'refs': {
@@ -336,10 +334,7 @@ class TestResolverRealWorldScenarios:
                 }
             ]
         }
-        with open(rules_file, 'w') as f:
-            yaml.dump(rules_content, f)
-
-        config = Config(config_dir=config_dir)
+        config = make_config(config_dir, rules_content)
 
         # First call - should resolve and cache
         rules1 = config.get_rules()
@@ -349,109 +344,45 @@ class TestResolverRealWorldScenarios:
         rules2 = config.get_rules()
         assert rules2 is rules1  # Same object
 
-        # Modify file
-        import time
-        time.sleep(0.01)
+        # Modify file, moving mtime forward instead of sleeping past its resolution
         rules_content['refs']['vars']['ratio'] = 2.0
-        with open(rules_file, 'w') as f:
-            yaml.dump(rules_content, f)
-        rules_file.touch()  # Force mtime update
+        rules_file.write_text(yaml.dump(rules_content, Dumper=Dumper))
+        bump_mtime(rules_file)
 
         # Third call - should reload and re-resolve
         rules3 = config.get_rules()
         assert rules3[0]['conditions'][0]['value'] == 2.0
         assert rules3 is not rules1  # Different object
 
-    def test_error_handling_in_real_scenario(self, tmp_path):
+    @pytest.mark.parametrize('refs, condition, error_type, expected', [
+        # Unknown variable - message lists the available vars
+        ({'vars': {'ratio': 1.0}},
+         {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.missing_var}'},
+         UnknownVariableError, ['missing_var', 'ratio']),
+        # Unknown reference - message lists the available refs
+        ({'conditions': {'existing': {'all': []}}},
+         {'$ref': 'conditions.nonexistent'},
+         UnknownRefError, ['nonexistent', 'existing']),
+        # Invalid ref format - missing group prefix
+        ({'conditions': {'test': {}}},
+         {'$ref': 'test'},
+         InvalidRefError, ['group.name']),
+    ], ids=['unknown-variable', 'unknown-ref', 'invalid-ref-format'])
+    def test_error_handling_in_real_scenario(self, config_dir, refs, condition, error_type, expected):
         """Test error handling with realistic mistakes"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
-
-        # Test 1: Unknown variable
         rules_content = {
-            'refs': {
-                'vars': {'ratio': 1.0}
-            },
+            'refs': refs,
             'rules': [
                 {
                     'name': 'Test',
                     'enabled': True,
-                    'conditions': [
-                        {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.missing_var}'}
-                    ],
+                    'conditions': [condition],
                     'actions': []
                 }
             ]
         }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
-
-        config = Config(config_dir=config_dir)
-        from qbt_rules.errors import UnknownVariableError
-        with pytest.raises(UnknownVariableError) as exc_info:
-            config.get_rules()
-        assert 'missing_var' in str(exc_info.value)
-        assert 'ratio' in str(exc_info.value)  # Shows available vars
-
-        # Test 2: Unknown reference
-        rules_content = {
-            'refs': {
-                'conditions': {
-                    'existing': {'all': []}
-                }
-            },
-            'rules': [
-                {
-                    'name': 'Test',
-                    'enabled': True,
-                    'conditions': [
-                        {'$ref': 'conditions.nonexistent'}
-                    ],
-                    'actions': []
-                }
-            ]
-        }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
-
-        config = Config(config_dir=config_dir)
-        from qbt_rules.errors import UnknownRefError
-        with pytest.raises(UnknownRefError) as exc_info:
-            config.get_rules()
-        assert 'nonexistent' in str(exc_info.value)
-        assert 'existing' in str(exc_info.value)  # Shows available refs
-
-        # Test 3: Invalid ref format
-        rules_content = {
-            'refs': {
-                'conditions': {'test': {}}
-            },
-            'rules': [
-                {
-                    'name': 'Test',
-                    'enabled': True,
-                    'conditions': [
-                        {'$ref': 'test'}  # Missing group prefix
-                    ],
-                    'actions': []
-                }
-            ]
-        }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
-
-        config = Config(config_dir=config_dir)
-        from qbt_rules.errors import InvalidRefError
-        with pytest.raises(InvalidRefError) as exc_info:
+        config = make_config(config_dir, rules_content)
+        with pytest.raises(error_type) as exc_info:
             config.get_rules()
-        assert 'group.name' in str(exc_info.value)
+        for text in expected:
+            assert text in str(exc_info.value)
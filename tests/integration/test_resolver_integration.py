@@ -1,32 +1,41 @@
 """Integration tests for resolver with Config and Engine"""
 
+import os
 import pytest
 from pathlib import Path
 import tempfile
 import yaml
 
-from qbt_rules.config import Config
+from qbt_rules.config import Config, uses_refs
+
+# Mirror the loader in qbt_rules.config: libyaml emitter when available
+Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+# Shared config.yml contents, serialized once at import
+QBT_CONFIG_YAML = yaml.dump({
+    'qbittorrent': {
+        'host': 'http://localhost:8080',
+        'username': 'admin',
+        'password': 'adminpass'
+    }
+}, Dumper=Dumper)
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    """Config directory with config.yml already written"""
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / 'config.yml').write_text(QBT_CONFIG_YAML)
+    return config_dir
 
 
 class TestResolverConfigIntegration:
     """Test resolver integration with Config class"""
 
-    def test_config_loads_and_resolves_rules_with_refs(self, tmp_path):
+    def test_config_loads_and_resolves_rules_with_refs(self, config_dir):
         """Should load config and resolve rules with refs block"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        # Create config.yml
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
-
         # Create rules.yml with refs
         rules_content = {
             'refs': {
@@ -62,8 +71,7 @@ class TestResolverConfigIntegration:
                 }
             ]
         }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
+        (config_dir / 'rules.yml').write_text(yaml.dump(rules_content, Dumper=Dumper))
 
         # Load config
         config = Config(config_dir=config_dir)
@@ -76,7 +84,7 @@ class TestResolverConfigIntegration:
         rule = rules[0]
 
         # Check refs were expanded
-        assert '$ref' not in str(rule)
+        assert not uses_refs(rule)
         assert 'all' in rule['conditions'][0]
 
         # Check variables were substituted
@@ -88,22 +96,8 @@ class TestResolverConfigIntegration:
         assert rule['actions'][0][0]['type'] == 'add_tag'
         assert rule['actions'][0][1]['type'] == 'stop'
 
-    def test_config_handles_rules_without_refs(self, tmp_path):
+    def test_config_handles_rules_without_refs(self, config_dir):
         """Should handle rules without refs block (backward compatibility)"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        # Create config.yml
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
-
         # Create rules.yml WITHOUT refs
         rules_content = {
             'rules': [
@@ -119,8 +113,7 @@ class TestResolverConfigIntegration:
                 }
             ]
         }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
+        (config_dir / 'rules.yml').write_text(yaml.dump(rules_content, Dumper=Dumper))
 
         # Load config
         config = Config(config_dir=config_dir)
@@ -132,22 +125,11 @@ class TestResolverConfigIntegration:
         assert len(rules) == 1
         assert rules[0]['conditions'][0]['value'] == 1.0
 
-    def test_config_caches_resolved_rules(self, tmp_path):
-        """Should cache resolved rules and reuse them"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        # Create config.yml
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
+        # No refs block - the raw rules are returned without a resolved copy
+        assert rules is config.get_rules(resolved=False)
 
+    def test_config_caches_resolved_rules(self, config_dir):
+        """Should cache resolved rules and reuse them"""
         # Create rules.yml with refs
         rules_content = {
             'refs': {
@@ -165,8 +147,7 @@ class TestResolverConfigIntegration:
                 }
             ]
         }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
+        (config_dir / 'rules.yml').write_text(yaml.dump(rules_content, Dumper=Dumper))
 
         # Load config
         config = Config(config_dir=config_dir)
@@ -178,22 +159,8 @@ class TestResolverConfigIntegration:
         # Should return same cached object
         assert rules1 is rules2
 
-    def test_config_invalidates_cache_on_reload(self, tmp_path):
+    def test_config_invalidates_cache_on_reload(self, config_dir):
         """Should invalidate cache when rules file is reloaded"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        # Create config.yml
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
-
         # Create initial rules.yml
         rules_file = config_dir / 'rules.yml'
         rules_content = {
@@ -207,8 +174,7 @@ class TestResolverConfigIntegration:
                 }
             ]
         }
-        with open(rules_file, 'w') as f:
-            yaml.dump(rules_content, f)
+        rules_file.write_text(yaml.dump(rules_content, Dumper=Dumper))
 
         # Load config
         config = Config(config_dir=config_dir)
@@ -218,35 +184,19 @@ class TestResolverConfigIntegration:
         assert rules1[0]['conditions'][0]['value'] == 1.0
 
         # Modify rules.yml
-        import time
-        time.sleep(0.01)  # Ensure mtime changes
         rules_content['refs']['vars']['min_ratio'] = 2.0
-        with open(rules_file, 'w') as f:
-            yaml.dump(rules_content, f)
+        rules_file.write_text(yaml.dump(rules_content, Dumper=Dumper))
 
-        # Force reload by touching the file
-        rules_file.touch()
+        # Force reload by moving mtime forward (no sleep past its resolution)
+        st = rules_file.stat()
+        os.utime(rules_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
 
         # Get rules again - should reload and re-resolve
         rules2 = config.get_rules()
         assert rules2[0]['conditions'][0]['value'] == 2.0
 
-    def test_config_get_rules_raw_vs_resolved(self, tmp_path):
+    def test_config_get_rules_raw_vs_resolved(self, config_dir):
         """Should support getting raw vs resolved rules"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        # Create config.yml
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
-
         # Create rules.yml with refs
         rules_content = {
             'refs': {
@@ -264,37 +214,22 @@ class TestResolverConfigIntegration:
                 }
             ]
         }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
+        (config_dir / 'rules.yml').write_text(yaml.dump(rules_content, Dumper=Dumper))
 
         # Load config
         config = Config(config_dir=config_dir)
 
         # Get raw rules
         raw_rules = config.get_rules(resolved=False)
-        assert '$ref' in str(raw_rules[0]['conditions'][0])
+        assert uses_refs(raw_rules[0]['conditions'][0])
 
         # Get resolved rules
         resolved_rules = config.get_rules(resolved=True)
-        assert '$ref' not in str(resolved_rules[0])
+        assert not uses_refs(resolved_rules[0])
         assert resolved_rules[0]['conditions'][0]['all'][0]['value'] == 1.5
 
-    def test_complex_multi_rule_resolution(self, tmp_path):
+    def test_complex_multi_rule_resolution(self, config_dir):
         """Should resolve multiple complex rules with shared refs"""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
-
-        # Create config.yml
-        config_content = {
-            'qbittorrent': {
-                'host': 'http://localhost:8080',
-                'username': 'admin',
-                'password': 'adminpass'
-            }
-        }
-        with open(config_dir / 'config.yml', 'w') as f:
-            yaml.dump(config_content, f)
-
         # Create complex rules.yml
         rules_content = {
             'refs': {
@@ -362,8 +297,7 @@ class TestResolverConfigIntegration:
                 }
             ]
         }
-        with open(config_dir / 'rules.yml', 'w') as f:
-            yaml.dump(rules_content, f)
+        (config_dir / 'rules.yml').write_text(yaml.dump(rules_content, Dumper=Dumper))
 
         # Load config
         config = Config(config_dir=config_dir)
@@ -128,6 +128,25 @@ class TestCleanupRules:
         assert len(mock_api.calls['add_tags']) == 1
         assert len(mock_api.calls['stop']) == 1
 
+    def test_single_string_tag(self, mock_api, mock_config, old_seeded_torrent):
+        """A tags param given as one string adds that tag, not its characters."""
+        rule = {
+            'name': 'Tag as string',
+            'enabled': True,
+            'conditions': {
+                'all': [{'field': 'info.ratio', 'operator': '>=', 'value': 3.0}]
+            },
+            'actions': [{'type': 'add_tag', 'params': {'tags': 'archive'}}]
+        }
+
+        mock_config.get_rules = Mock(return_value=[rule])
+        mock_api.torrents_data = {old_seeded_torrent['hash']: dict(old_seeded_torrent, tags='')}
+
+        engine = RulesEngine(mock_api, mock_config)
+        engine.run(context='weekly-cleanup')
+
+        assert mock_api.torrents_data[old_seeded_torrent['hash']]['tags'] == 'archive'
+
 
 class TestSeedingManagementRules:
     """Test seeding management scenarios."""
@@ -35,6 +35,7 @@ class TestGetServerConfig:
         assert config['port'] == 5000
         assert config['api_key'] is None
         assert config['workers'] == 1
+        assert config['threads'] == 8
 
     def test_uses_args_values(self):
         """Should use CLI argument values when provided"""
@@ -61,7 +62,8 @@ class TestGetServerConfig:
                 'host': '192.168.1.1',
                 'port': 9000,
                 'api_key': 'config-key',
-                'workers': 4
+                'workers': 4,
+                'threads': 16
             }
         })
 
@@ -71,6 +73,7 @@ class TestGetServerConfig:
         assert config['port'] == 9000
         assert config['api_key'] == 'config-key'
         assert config['workers'] == 4
+        assert config['threads'] == 16
 
 
 class TestGetClientConfig:
@@ -213,6 +216,7 @@ class TestRunServerMode:
             host='0.0.0.0',
             port=5000,
             workers=1,
+            threads=8,
             log_http_access=False
         )
 
@@ -17,7 +17,9 @@ from qbt_rules.config import (
     parse_duration,
     resolve_config,
     copy_default_if_missing,
+    uses_refs,
     DEFAULT_CONFIG_SHARE_PATH,
+    YAML_LOADER,
 )
 from qbt_rules.errors import ConfigurationError
 
@@ -424,6 +426,29 @@ class TestExpandEnvVars:
         assert result == 'plain string'
 
 
+# ============================================================================
+# uses_refs()
+# ============================================================================
+
+class TestUsesRefs:
+    """Test uses_refs() function."""
+
+    def test_plain_rules(self):
+        """Rules without placeholders need no resolving."""
+        rules = [{'name': 'r', 'conditions': {'all': [{'field': 'info.ratio', 'operator': '>', 'value': 2}]}}]
+        assert uses_refs(rules) is False
+
+    def test_nested_ref(self):
+        """A $ref key anywhere in the structure is detected."""
+        rules = [{'name': 'r', 'conditions': {'all': [{'$ref': 'conditions.x'}]}}]
+        assert uses_refs(rules) is True
+
+    def test_variable_placeholder(self):
+        """A ${...} placeholder in a string value is detected."""
+        rules = [{'name': 'r', 'actions': [{'type': 'add_tag', 'params': {'tags': ['${vars.tag}']}}]}]
+        assert uses_refs(rules) is True
+
+
 # ============================================================================
 # load_yaml_file()
 # ============================================================================
@@ -439,6 +464,20 @@ class TestLoadYamlFile:
         result = load_yaml_file(yaml_file)
         assert result == {'key': 'value', 'number': 42}
 
+    def test_uses_libyaml_safe_loader_when_available(self):
+        """Prefer the C safe loader and fall back to the pure-Python one."""
+        import yaml
+
+        assert YAML_LOADER is getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+    def test_rejects_python_tags(self, tmp_path):
+        """Stay a safe loader - arbitrary Python objects are refused."""
+        yaml_file = tmp_path / "unsafe.yml"
+        yaml_file.write_text("value: !!python/object/apply:os.getcwd []")
+
+        with pytest.raises(ConfigurationError):
+            load_yaml_file(yaml_file)
+
     def test_nested_yaml(self, tmp_path):
         """Load nested YAML structure."""
         yaml_file = tmp_path / "nested.yml"
@@ -797,6 +836,25 @@ engine:
         config = Config(config_dir)
         assert config.is_dry_run() is True
 
+    def test_store_tracebacks_false_by_default(self, tmp_config_dir):
+        """Failed jobs store only the error summary by default."""
+        config = Config(tmp_config_dir)
+        assert config.store_tracebacks() is False
+
+    def test_store_tracebacks_string_value_from_config(self, tmp_path):
+        """store_tracebacks handles string values from YAML."""
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+
+        (config_dir / "config.yml").write_text("""
+queue:
+  store_tracebacks: "yes"
+""")
+        (config_dir / "rules.yml").write_text("rules: []")
+
+        config = Config(config_dir)
+        assert config.store_tracebacks() is True
+
     def test_get_log_level_default(self, tmp_config_dir):
         """Get default log level."""
         config = Config(tmp_config_dir)
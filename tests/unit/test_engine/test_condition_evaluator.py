@@ -613,6 +613,18 @@ class TestOperators:
         assert evaluator._apply_operator('test123', 'matches', r'\d+', 'field') is True
         assert evaluator._apply_operator('testABC', 'matches', r'\d+', 'field') is False
 
+    def test_operator_matches_compiles_pattern_once(self, mock_api):
+        """Operator matches reuses the compiled pattern across evaluations."""
+        from qbt_rules.engine import _compile_pattern
+
+        evaluator = ConditionEvaluator(mock_api)
+        _compile_pattern.cache_clear()
+
+        for value in ('a1', 'b2', 'c3'):
+            assert evaluator._apply_operator(value, 'matches', r'^[a-c]\d$', 'field') is True
+
+        assert _compile_pattern.cache_info().misses == 1
+
     # List operators
     def test_operator_in_list(self, mock_api):
         """Operator in works with list."""
@@ -727,6 +739,16 @@ class TestOperators:
         old_timestamp = 1700000000 - 7776000  # 90 days ago
         assert evaluator._apply_operator(old_timestamp, 'newer_than', '30 days', 'field') is False
 
+    @patch('qbt_rules.utils.time.time', return_value=1700000000)
+    def test_time_operators_use_pass_reference_time(self, mock_time, mock_api):
+        """Time operators compare against evaluator.now when it is set."""
+        evaluator = ConditionEvaluator(mock_api)
+        evaluator.now = 1800000000
+        timestamp = 1700000000 - 86400  # 1 day before the patched clock
+
+        assert evaluator._apply_operator(timestamp, 'older_than', '30 days', 'field') is True
+        mock_time.assert_not_called()
+
     # Unknown operator
     def test_unknown_operator_raises_error(self, mock_api):
         """Unknown operator raises OperatorError."""
@@ -455,6 +455,100 @@ class TestStatisticsTracking:
 
         assert engine.stats.processed == 2
 
+    def test_reset_stats_zeroes_in_place(self, mock_api, mock_config, sample_torrent):
+        """reset_stats() zeroes the existing stats object for engine reuse."""
+        rule = {
+            'name': 'Test rule',
+            'enabled': True,
+            'conditions': {'all': [{'field': 'info.ratio', 'operator': '>=', 'value': 1.0}]},
+            'actions': [{'type': 'add_tag', 'params': {'tags': ['tag1']}}]
+        }
+        mock_config.get_rules = Mock(return_value=[rule])
+        mock_api.torrents_data = {sample_torrent['hash']: sample_torrent}
+
+        engine = RulesEngine(mock_api, mock_config)
+        engine.run(context='adhoc-run')
+        stats = engine.stats
+
+        engine.reset_stats()
+
+        assert engine.stats is stats
+        assert stats == RuleStats()
+
+    def test_set_dry_run_updates_executor(self, mock_api, mock_config):
+        """set_dry_run() switches the engine and its action executor together."""
+        engine = RulesEngine(mock_api, mock_config, dry_run=False)
+
+        engine.set_dry_run(True)
+
+        assert engine.dry_run is True
+        assert engine.executor.dry_run is True
+
+    def test_run_clears_evaluator_caches(self, mock_api, mock_config):
+        """A reused engine does not see API caches from a previous run."""
+        mock_config.get_rules = Mock(return_value=[])
+        mock_api.torrents_data = {}
+
+        engine = RulesEngine(mock_api, mock_config)
+        engine.evaluator.trackers_cache['stale'] = [{'url': 'http://old'}]
+        engine.run(context='adhoc-run')
+
+        assert engine.evaluator.trackers_cache == {}
+
+    def test_run_releases_reference_time(self, mock_api, mock_config):
+        """The per-pass clock sample does not outlive run()."""
+        mock_config.get_rules = Mock(return_value=[])
+        mock_api.torrents_data = {}
+
+        engine = RulesEngine(mock_api, mock_config)
+        engine.run(context='adhoc-run')
+
+        assert engine.evaluator.now is None
+
+
+# ============================================================================
+# Rule Compilation
+# ============================================================================
+
+class TestRuleCompilation:
+    """Test one-time preparation of rules."""
+
+    def test_compiled_rules_reused_for_same_rules_list(self, mock_api, mock_config):
+        """Same rules list object is compiled only once across runs."""
+        rules = [{'name': 'r', 'conditions': {}, 'actions': []}]
+        mock_config.get_rules = Mock(return_value=rules)
+        mock_api.torrents_data = {}
+
+        engine = RulesEngine(mock_api, mock_config)
+        with patch.object(engine, '_compile_rules', wraps=engine._compile_rules) as compile_spy:
+            engine.run(context='adhoc-run')
+            engine.run(context='adhoc-run')
+
+        compile_spy.assert_called_once_with(rules)
+
+    def test_reloaded_rules_are_recompiled(self, mock_api, mock_config):
+        """A new rules list (reload) replaces the compiled rules."""
+        mock_api.torrents_data = {}
+        engine = RulesEngine(mock_api, mock_config)
+
+        mock_config.get_rules = Mock(return_value=[{'name': 'old', 'conditions': {}, 'actions': []}])
+        engine.run(context='adhoc-run')
+        mock_config.get_rules = Mock(return_value=[{'name': 'new', 'conditions': {}, 'actions': []}])
+        engine.run(context='adhoc-run')
+
+        assert [compiled[0] for compiled in engine._compiled] == ['new']
+
+    def test_compile_drops_disabled_rules(self, mock_api, mock_config):
+        """Disabled rules are left out and defaults are filled in."""
+        engine = RulesEngine(mock_api, mock_config)
+
+        compiled = engine._compile_rules([
+            {'name': 'off', 'enabled': False, 'conditions': {}, 'actions': []},
+            {'conditions': {'all': []}},
+        ])
+
+        assert compiled == [('unnamed', {'all': []}, [], None, False)]
+
 
 # ============================================================================
 # Error Handling
@@ -1,7 +1,7 @@
 """
 Comprehensive tests for queue_manager.py
 
-Tests JobStatus class, QueueManager abstract interface, factory function,
+Tests JobStatus class, QueueManager protocol interface, factory function,
 and utility methods.
 """
 
@@ -11,9 +11,13 @@ from unittest.mock import Mock, patch, MagicMock
 import uuid
 
 from qbt_rules.queue_manager import (
+    JobSignal,
     JobStatus,
     QueueManager,
-    create_queue
+    SNAPSHOT_STATUSES,
+    create_queue,
+    dump_json,
+    load_json
 )
 
 
@@ -60,6 +64,12 @@ class TestJobStatus:
         statuses = JobStatus.all()
         assert len(statuses) == len(set(statuses))
 
+    def test_all_method_returns_fresh_list(self):
+        """all() returns a new list each call so callers cannot mutate the canonical set"""
+        statuses = JobStatus.all()
+        statuses.clear()
+        assert JobStatus.all() == ["pending", "processing", "completed", "failed", "cancelled"]
+
     def test_all_method_no_none_values(self):
         """all() does not contain None values"""
         statuses = JobStatus.all()
@@ -396,6 +406,107 @@ class TestQueueManagerCreateJobDict:
         assert before <= created_dt <= after
 
 
+# ============================================================================
+# QueueManager Protocol Tests
+# ============================================================================
+
+class TestQueueManagerProtocol:
+    """Test QueueManager structural typing"""
+
+    def test_sqlite_queue_satisfies_protocol(self, tmp_path):
+        """SQLiteQueue is recognised as a QueueManager"""
+        queue = create_queue('sqlite', db_path=str(tmp_path / "test.db"))
+        assert isinstance(queue, QueueManager)
+        queue.close()
+
+    def test_incomplete_object_does_not_satisfy_protocol(self):
+        """Objects missing queue methods are not QueueManagers"""
+        class NotAQueue:
+            def enqueue(self, context=None, hash_filter=None): pass
+
+        assert not isinstance(NotAQueue(), QueueManager)
+
+    def test_default_snapshot_composes_individual_calls(self):
+        """The default snapshot() is built from health_check/count_jobs/get_queue_depth"""
+        queue = MagicMock()
+        queue.health_check.return_value = True
+        queue.get_queue_depth.return_value = 3
+        queue.count_jobs.side_effect = lambda status=None: 7 if status is None else 1
+
+        snapshot = QueueManager.snapshot(queue)
+
+        assert snapshot['healthy'] is True
+        assert snapshot['depth'] == 3
+        assert snapshot['counts'] == dict.fromkeys(SNAPSHOT_STATUSES, 1)
+        assert queue.count_jobs.call_count == len(SNAPSHOT_STATUSES)
+
+    def test_default_snapshot_unhealthy_skips_counts(self):
+        """The default snapshot() does not query counts when the backend is unhealthy"""
+        queue = MagicMock()
+        queue.health_check.return_value = False
+
+        snapshot = QueueManager.snapshot(queue)
+
+        assert snapshot['healthy'] is False
+        queue.count_jobs.assert_not_called()
+
+    def test_default_dequeue_blocking_timeout_queries_once(self):
+        """An idle dequeue_blocking() cycle reads the queue only once"""
+        queue = MagicMock()
+        queue.dequeue.return_value = None
+        queue._job_signal = JobSignal()
+
+        assert QueueManager.dequeue_blocking(queue, timeout=0.01) is None
+        assert queue.dequeue.call_count == 1
+
+    def test_default_dequeue_blocking_rereads_after_signal(self):
+        """A signalled dequeue_blocking() re-reads the queue"""
+        queue = MagicMock()
+        queue.dequeue.side_effect = [None, {'job_id': 'a'}]
+        queue._job_signal = JobSignal()
+        queue._job_signal.notify()
+
+        assert QueueManager.dequeue_blocking(queue, timeout=5.0) == {'job_id': 'a'}
+
+    def test_default_dequeue_blocking_creates_missing_signal(self):
+        """Backends that never set _job_signal get one on first use"""
+        class ConcreteQueue(QueueManager):
+            def dequeue(self):
+                return None
+
+        queue = ConcreteQueue()
+        queue.wake()
+
+        assert isinstance(queue._job_signal, JobSignal)
+        assert queue.dequeue_blocking(timeout=5.0) is None
+
+
+# ============================================================================
+# JSON Serialization Boundary Tests
+# ============================================================================
+
+class TestJsonSerialization:
+    """Test dump_json()/load_json() helpers used by queue backends"""
+
+    def test_round_trip(self):
+        """dump_json() output is parsed back by load_json()"""
+        result = {'total_torrents': 10, 'errors': 0, 'dry_run': False, 'ratio': 1.5}
+        text = dump_json(result)
+        assert isinstance(text, str)
+        assert load_json(text) == result
+
+    def test_load_accepts_stdlib_output(self):
+        """load_json() reads rows written by the stdlib json module"""
+        assert load_json('{"count": 5, "dry_run": true}') == {'count': 5, 'dry_run': True}
+
+    def test_fallback_without_orjson(self):
+        """Helpers fall back to the stdlib json module when orjson is missing"""
+        with patch('qbt_rules.queue_manager.orjson', None):
+            text = dump_json({'count': 5})
+            assert text == '{"count": 5}'
+            assert load_json(text) == {'count': 5}
+
+
 # ============================================================================
 # create_queue Factory Function Tests
 # ============================================================================
@@ -894,6 +894,31 @@ class TestRedisQueueCleanup:
 
         assert deleted == 5
 
+    def test_cleanup_deletes_in_batches(self, queue, redis_client):
+        """Should remove more jobs than fit in a single batch, skipping ineligible ones"""
+        queue.CLEANUP_BATCH_SIZE = 2
+        old_timestamp = (datetime.now(timezone.utc) - timedelta(days=10)).timestamp()
+        time_key = 'qbt_rules:jobs:by_time'
+
+        job_ids = []
+        for _ in range(5):
+            job_id = queue.enqueue(context='batch')
+            queue.dequeue()
+            queue.update_status(job_id, JobStatus.COMPLETED,
+                              completed_at=datetime.now(timezone.utc))
+            redis_client.zadd(time_key, {job_id: old_timestamp})
+            job_ids.append(job_id)
+
+        pending_id = queue.enqueue()
+        redis_client.zadd(time_key, {pending_id: old_timestamp})
+
+        deleted = queue.cleanup_old_jobs(retention_period=7 * 86400)
+
+        assert deleted == 5
+        assert all(queue.get_job(job_id) is None for job_id in job_ids)
+        assert queue.get_job(pending_id) is not None
+        assert redis_client.scard('qbt_rules:jobs:context:batch') == 0
+
 
 class TestRedisQueueGetQueueDepth:
     """Test get_queue_depth() method"""
@@ -1017,6 +1042,28 @@ class TestRedisQueueHealthCheck:
         result = queue.health_check()
         assert result is False
 
+    def test_snapshot_reports_depth_and_counts(self, queue):
+        """Should report health, pending depth and active job counts together"""
+        queue.enqueue()
+        queue.enqueue()
+        queue.enqueue()
+        queue.dequeue()
+
+        snapshot = queue.snapshot()
+
+        assert snapshot['healthy'] is True
+        assert snapshot['depth'] == 2
+        assert snapshot['counts'] == {JobStatus.PENDING: 2, JobStatus.PROCESSING: 1}
+
+    def test_snapshot_unhealthy_when_disconnected(self, queue, mocker):
+        """Should report unhealthy when the pipeline fails"""
+        mocker.patch.object(queue.redis, 'pipeline', side_effect=redis.ConnectionError())
+
+        snapshot = queue.snapshot()
+
+        assert snapshot['healthy'] is False
+        assert snapshot['counts'][JobStatus.PENDING] == 0
+
 
 class TestRedisQueueHashToDict:
     """Test _hash_to_dict() conversion"""
@@ -527,3 +527,76 @@ class TestDeepCopy:
 
         # Resolved should be different
         assert '$ref' not in resolved['conditions'][0]
+
+
+class TestResolverErrorOrder:
+    """Test which error wins when a rule has several"""
+
+    def test_first_error_in_document_order_wins(self):
+        """Should raise the ref error in conditions before a variable error in actions"""
+        resolver = RuleResolver(refs={'vars': {}})
+        rule = {
+            'name': 'test',
+            'conditions': [{'$ref': 'conditions.missing'}],
+            'actions': [{'type': 'add_tag', 'params': {'tags': ['${vars.missing}']}}]
+        }
+
+        with pytest.raises(UnknownRefError):
+            resolver.resolve_rule(rule)
+
+
+class TestResolverMemoization:
+    """Test memoization of expanded refs"""
+
+    def test_resolve_rule_sees_rule_changes(self):
+        """Should resolve the rule as it is now, not as it was first resolved"""
+        resolver = RuleResolver(refs={'vars': {'min_ratio': 1.0}})
+        rule = {
+            'name': 'test',
+            'conditions': [{'field': 'info.ratio', 'operator': '>=', 'value': '${vars.min_ratio}'}],
+            'actions': []
+        }
+        first = resolver.resolve_rule(rule)
+
+        rule['actions'] = [{'type': 'stop'}]
+
+        assert first['actions'] == []
+        assert resolver.resolve_rule(rule)['actions'] == [{'type': 'stop'}]
+
+    def test_repeated_ref_expanded_once(self, mocker):
+        """Should look up a ref once and reuse its expansion"""
+        refs = {
+            'conditions': {
+                'seeded': {'all': [{'field': 'info.ratio', 'operator': '>=', 'value': 1}]}
+            }
+        }
+        resolver = RuleResolver(refs=refs)
+        lookup = mocker.spy(resolver, '_lookup_ref')
+
+        rule = {
+            'name': 'test',
+            'conditions': {'any': [{'$ref': 'conditions.seeded'}, {'$ref': 'conditions.seeded'}]},
+            'actions': []
+        }
+        resolved = resolver.resolve_rule(rule)
+
+        assert lookup.call_count == 1
+        assert resolved['conditions']['any'][0] == refs['conditions']['seeded']
+        assert resolved['conditions']['any'][1] == refs['conditions']['seeded']
+
+    def test_clear_cache_applies_changed_vars(self):
+        """Should re-resolve with updated vars after clear_cache()"""
+        refs = {
+            'vars': {'min_ratio': 1.0},
+            'conditions': {
+                'seeded': {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.min_ratio}'}
+            }
+        }
+        resolver = RuleResolver(refs=refs)
+        rule = {'name': 'test', 'conditions': [{'$ref': 'conditions.seeded'}], 'actions': []}
+        assert resolver.resolve_rule(rule)['conditions'][0]['value'] == 1.0
+
+        resolver.vars['min_ratio'] = 2.0
+        resolver.clear_cache()
+
+        assert resolver.resolve_rule(rule)['conditions'][0]['value'] == 2.0
@@ -1,5 +1,7 @@
 """Comprehensive edge case and stress tests for RuleResolver"""
 
+import sys
+
 import pytest
 
 from qbt_rules.resolver import RuleResolver
@@ -524,6 +526,44 @@ class TestReferenceEdgeCases:
         with pytest.raises(InvalidRefError):
             resolver.resolve_rule(rule)
 
+    def test_ref_chain_deeper_than_recursion_limit(self):
+        """Should expand ref chains longer than Python's recursion limit"""
+        depth = sys.getrecursionlimit() + 100
+        conditions = {
+            f'c{i}': {'all': [{'$ref': f'conditions.c{i + 1}'}]}
+            for i in range(depth)
+        }
+        conditions[f'c{depth}'] = {'field': 'info.ratio', 'operator': '>=', 'value': 1.0}
+        resolver = RuleResolver(refs={'conditions': conditions})
+
+        rule = {
+            'name': 'test',
+            'conditions': [{'$ref': 'conditions.c0'}],
+            'actions': []
+        }
+
+        node = resolver.resolve_rule(rule)['conditions'][0]
+        for _ in range(depth):
+            node = node['all'][0]
+        assert node == {'field': 'info.ratio', 'operator': '>=', 'value': 1.0}
+
+    def test_inline_nesting_deeper_than_recursion_limit(self):
+        """Should substitute variables in inline trees deeper than the recursion limit"""
+        depth = sys.getrecursionlimit() + 100
+        resolver = RuleResolver(refs={'vars': {'min_ratio': 1.0}})
+
+        leaf = {'field': 'info.ratio', 'operator': '>=', 'value': '${vars.min_ratio}'}
+        tree = leaf
+        for _ in range(depth):
+            tree = {'all': [tree]}
+
+        rule = {'name': 'test', 'conditions': tree, 'actions': []}
+
+        node = resolver.resolve_rule(rule)['conditions']
+        for _ in range(depth):
+            node = node['all'][0]
+        assert node['value'] == 1.0
+
 
 class TestCircularReferenceDetection:
     """Test circular reference detection"""
@@ -573,8 +613,30 @@ class TestCircularReferenceDetection:
             'actions': []
         }
 
-        with pytest.raises(CircularRefError):
+        with pytest.raises(CircularRefError) as exc_info:
             resolver.resolve_rule(rule)
+        # Chain is reported in expansion order
+        assert 'conditions.a -> conditions.b -> conditions.c -> conditions.a' in str(exc_info.value)
+
+    def test_sibling_refs_to_same_target_not_circular(self):
+        """Should allow the same ref to be used repeatedly across siblings"""
+        refs = {
+            'conditions': {
+                'leaf': {'field': 'info.ratio', 'operator': '>=', 'value': 1.0},
+                'pair': {'all': [{'$ref': 'conditions.leaf'}, {'$ref': 'conditions.leaf'}]}
+            }
+        }
+        resolver = RuleResolver(refs=refs)
+
+        rule = {
+            'name': 'test',
+            'conditions': [{'$ref': 'conditions.pair'}, {'$ref': 'conditions.leaf'}],
+            'actions': []
+        }
+
+        resolved = resolver.resolve_rule(rule)
+        assert resolved['conditions'][0]['all'][1]['field'] == 'info.ratio'
+        assert resolved['conditions'][1]['value'] == 1.0
 
 
 class TestRefTypeValidation:
@@ -12,13 +12,13 @@ Test coverage for:
 
 import pytest
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch, PropertyMock
 
 from flask import Flask
 
 from qbt_rules.server import create_app, require_api_key, run_server
-from qbt_rules.queue_manager import JobStatus
+from qbt_rules.queue_manager import JobStatus, QueueManager
 from qbt_rules.__version__ import __version__
 
 
@@ -55,6 +55,8 @@ def mock_queue(mocker):
         'average_execution_time': None
     }
     queue.cancel_job.return_value = True
+    # Derive the snapshot from the individual mocks via the protocol default
+    queue.snapshot.side_effect = lambda: QueueManager.snapshot(queue)
 
     return queue
 
@@ -138,6 +140,115 @@ class TestCreateApp:
 
         assert app.logger.disabled is True
 
+    def test_create_app_uses_orjson_provider(self, mock_queue, mock_worker):
+        """Should encode responses with orjson when it is installed"""
+        pytest.importorskip('orjson')
+        from qbt_rules.server import OrjsonProvider
+
+        app = create_app(mock_queue, mock_worker, 'test-key')
+
+        assert isinstance(app.json, OrjsonProvider)
+
+    def test_create_app_without_orjson_uses_default_provider(self, mock_queue, mock_worker, mocker):
+        """Should keep Flask's default JSON provider when orjson is missing"""
+        from qbt_rules.server import OrjsonProvider
+
+        mocker.patch('qbt_rules.server.orjson', None)
+        app = create_app(mock_queue, mock_worker, 'test-key')
+
+        assert not isinstance(app.json, OrjsonProvider)
+
+    def test_orjson_provider_matches_default_wire_format(self, mock_queue, mock_worker):
+        """Should sort keys and format datetimes exactly like Flask's default provider"""
+        pytest.importorskip('orjson')
+        from flask.json.provider import DefaultJSONProvider
+
+        app = create_app(mock_queue, mock_worker, 'test-key')
+        payload = {
+            'status': 'completed',
+            'created_at': datetime(2026, 10, 17, 1, 13, 12, tzinfo=timezone.utc),
+            'result': {'errors': 0, 'actions_executed': 3},
+        }
+
+        with app.app_context():
+            response = app.json.response(payload)
+            expected = DefaultJSONProvider(app).response(payload)
+
+        assert response.data == expected.data
+        assert b'"created_at":"Sat, 17 Oct 2026 01:13:12 GMT"' in response.data
+        assert response.mimetype == 'application/json'
+
+    def test_orjson_provider_sends_non_ascii_as_utf8(self, mock_queue, mock_worker):
+        """Should send non-ASCII text as UTF-8 rather than \\u escapes"""
+        pytest.importorskip('orjson')
+
+        app = create_app(mock_queue, mock_worker, 'test-key')
+
+        with app.app_context():
+            response = app.json.response({'name': 'caf\u00e9'})
+
+        assert response.data == '{"name":"caf\u00e9"}\n'.encode('utf-8')
+        assert response.get_json() == {'name': 'caf\u00e9'}
+
+    def test_orjson_provider_encodes_nan_as_null(self, mock_queue, mock_worker):
+        """Should encode NaN as null (Flask's default provider emits NaN)"""
+        pytest.importorskip('orjson')
+
+        app = create_app(mock_queue, mock_worker, 'test-key')
+
+        with app.app_context():
+            assert app.json.dumps({'ratio': float('nan')}) == '{"ratio":null}'
+
+    def test_orjson_provider_falls_back_for_big_ints(self, mock_queue, mock_worker):
+        """Should hand integers wider than 64 bits to Flask's default provider"""
+        pytest.importorskip('orjson')
+        from flask.json.provider import DefaultJSONProvider
+
+        app = create_app(mock_queue, mock_worker, 'test-key')
+        payload = {'size': 2 ** 70}
+
+        with app.app_context():
+            response = app.json.response(payload)
+            expected = DefaultJSONProvider(app).response(payload)
+
+        assert response.status_code == 200
+        assert response.data == expected.data
+        assert app.json.loads(app.json.dumps(payload)) == payload
+
+
+class TestNowIso:
+    """Test now_iso() cached timestamp helper"""
+
+    def test_returns_utc_iso_timestamp(self):
+        """Should return a UTC ISO 8601 timestamp"""
+        from qbt_rules.server import now_iso
+
+        parsed = datetime.fromisoformat(now_iso())
+
+        assert parsed.utcoffset().total_seconds() == 0
+        assert parsed.microsecond == 0
+
+    def test_formats_once_per_second(self, mocker):
+        """Should reuse the formatted string within the same second"""
+        from qbt_rules import server
+
+        mocker.patch('qbt_rules.server.time.time', return_value=1735732800.2)
+        first = server.now_iso()
+        mocker.patch('qbt_rules.server.time.time', return_value=1735732800.9)
+
+        assert server.now_iso() is first
+        assert first == '2025-01-01T12:00:00+00:00'
+
+    def test_refreshes_on_next_second(self, mocker):
+        """Should produce a new timestamp once the second changes"""
+        from qbt_rules import server
+
+        mocker.patch('qbt_rules.server.time.time', return_value=1735732800.5)
+        server.now_iso()
+        mocker.patch('qbt_rules.server.time.time', return_value=1735732801.0)
+
+        assert server.now_iso() == '2025-01-01T12:00:01+00:00'
+
 
 class TestAuthenticationDecorator:
     """Test require_api_key decorator"""
@@ -156,6 +267,21 @@ class TestAuthenticationDecorator:
 
         assert response.status_code != 401
 
+    def test_auth_header_takes_precedence_over_query(self, client):
+        """Should check the X-API-Key header before the query parameter"""
+        response = client.get(
+            '/api/jobs?key=test-api-key-12345',
+            headers={'X-API-Key': 'wrong-key'}
+        )
+
+        assert response.status_code == 401
+
+    def test_auth_with_non_ascii_key(self, client):
+        """Should reject non-ASCII keys with 401 rather than erroring"""
+        response = client.get('/api/jobs?key=cl\u00e9')
+
+        assert response.status_code == 401
+
     def test_auth_with_missing_key(self, client):
         """Should return 401 when API key is missing"""
         response = client.get('/api/jobs')
@@ -524,6 +650,13 @@ class TestHealthEndpoint:
         data = json.loads(response.data)
         assert data['version'] == __version__
 
+    def test_health_skips_worker_queue_depth(self, client, mock_worker):
+        """Should take the depth from the queue snapshot, not the worker"""
+        response = client.get('/api/health')
+
+        assert response.status_code == 200
+        mock_worker.get_status.assert_called_once_with(include_queue_depth=False)
+
     def test_health_includes_queue_info(self, client, mock_queue):
         """Should include queue information"""
         mock_queue.get_queue_depth.return_value = 5
@@ -609,6 +742,28 @@ class TestHealthEndpoint:
         # Verify it's a valid ISO timestamp
         datetime.fromisoformat(data['timestamp'])
 
+    def test_health_repeated_probes_served_from_cache(self, client, mock_queue):
+        """Should answer probes within the cache TTL without re-running checks"""
+        first = client.get('/api/health')
+        second = client.get('/api/health')
+
+        assert second.status_code == first.status_code
+        assert second.data == first.data
+        assert second.headers['Content-Type'] == 'application/json'
+        mock_queue.health_check.assert_called_once()
+
+    def test_health_cache_expires(self, client, mock_queue, mocker):
+        """Should re-run checks once the cached response is stale"""
+        monotonic = mocker.patch('qbt_rules.server.time.monotonic', return_value=100.0)
+        client.get('/api/health')
+
+        monotonic.return_value = 102.0
+        mock_queue.health_check.return_value = False
+        response = client.get('/api/health')
+
+        assert response.status_code == 503
+        assert mock_queue.health_check.call_count == 2
+
 
 class TestStatsEndpoint:
     """Test GET /api/stats endpoint"""
@@ -642,6 +797,19 @@ class TestStatsEndpoint:
         assert data['jobs']['failed'] == 3
         assert data['jobs']['cancelled'] == 2
 
+    def test_stats_skips_worker_queue_depth(self, client, valid_headers, mock_queue, mock_worker):
+        """Should query the queue depth once, not again through the worker"""
+        mock_queue.get_stats.return_value = {
+            'total_jobs': 0, 'pending': 0, 'processing': 0, 'completed': 0,
+            'failed': 0, 'cancelled': 0, 'average_execution_time': None
+        }
+
+        response = client.get('/api/stats', headers=valid_headers)
+
+        assert response.status_code == 200
+        mock_worker.get_status.assert_called_once_with(include_queue_depth=False)
+        mock_queue.get_queue_depth.assert_called_once()
+
     def test_stats_returns_performance_metrics(self, client, valid_headers, mock_queue):
         """Should return performance metrics"""
         mock_queue.get_stats.return_value = {
@@ -760,6 +928,22 @@ class TestVersionEndpoint:
         assert 'python_version' in data
         assert isinstance(data['python_version'], str)
 
+    def test_version_returns_json_content_type(self, client):
+        """Should serve the precomputed body as JSON"""
+        response = client.get('/api/version')
+
+        assert response.mimetype == 'application/json'
+
+    def test_version_body_uses_app_json_provider(self, app, client):
+        """Should be encoded exactly like a jsonify() response"""
+        from qbt_rules.server import VERSION_INFO
+
+        response = client.get('/api/version')
+
+        with app.app_context():
+            expected = app.json.response(VERSION_INFO).get_data()
+        assert response.data == expected
+
 
 class TestErrorHandlers:
     """Test error handlers"""
@@ -829,6 +1013,7 @@ class TestGunicornIntegration:
         assert sig.parameters['host'].default == '0.0.0.0'
         assert sig.parameters['port'].default == 5000
         assert sig.parameters['workers'].default == 1
+        assert sig.parameters['threads'].default == 8
 
     def test_run_server_source_contains_gunicorn(self):
         """Should use Gunicorn for production serving"""
@@ -19,8 +19,8 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List
 
-from qbt_rules.queue_backends.sqlite_queue import SQLiteQueue
-from qbt_rules.queue_manager import JobStatus, QueueManager
+from qbt_rules.queue_backends.sqlite_queue import SNAPSHOT_QUERY, SQLiteQueue
+from qbt_rules.queue_manager import SNAPSHOT_STATUSES, JobStatus, QueueManager
 
 
 # ============================================================================
@@ -148,6 +148,30 @@ class TestSQLiteQueueInitialization:
         assert enabled == 1
         queue.close()
 
+    def test_init_relaxes_synchronous_under_wal(self, tmp_path):
+        """Connections use synchronous=NORMAL so commits skip the per-write fsync"""
+        db_path = tmp_path / "test.db"
+        queue = SQLiteQueue(db_path=str(db_path))
+
+        conn = queue._get_connection()
+        cursor = conn.execute('PRAGMA synchronous')
+        level = cursor.fetchone()[0]
+
+        assert level == 1  # NORMAL
+        queue.close()
+
+    def test_init_keeps_temp_store_in_memory(self, tmp_path):
+        """Connections keep temporary tables and sort b-trees in memory"""
+        db_path = tmp_path / "test.db"
+        queue = SQLiteQueue(db_path=str(db_path))
+
+        conn = queue._get_connection()
+        cursor = conn.execute('PRAGMA temp_store')
+        store = cursor.fetchone()[0]
+
+        assert store == 2  # MEMORY
+        queue.close()
+
     def test_db_path_stored_as_path_object(self, tmp_path):
         """Database path stored as Path object"""
         db_path = tmp_path / "test.db"
@@ -536,6 +560,59 @@ class TestSQLiteQueueDequeue:
 
         queue.close()
 
+    def test_dequeue_blocking_returns_pending_job_immediately(self, tmp_path):
+        """dequeue_blocking() does not wait when a job is already pending"""
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+        job_id = queue.enqueue()
+
+        start = time.monotonic()
+        job = queue.dequeue_blocking(timeout=5.0)
+
+        assert job['job_id'] == job_id
+        assert time.monotonic() - start < 1.0
+
+        queue.close()
+
+    def test_dequeue_blocking_times_out_on_empty_queue(self, tmp_path):
+        """dequeue_blocking() returns None once the timeout elapses"""
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+
+        assert queue.dequeue_blocking(timeout=0.05) is None
+
+        queue.close()
+
+    def test_dequeue_blocking_wakes_on_enqueue(self, tmp_path):
+        """dequeue_blocking() returns as soon as another thread enqueues"""
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+        results = []
+
+        consumer = threading.Thread(target=lambda: results.append(queue.dequeue_blocking(timeout=30.0)))
+        consumer.start()
+        time.sleep(0.05)
+        job_id = queue.enqueue()
+        consumer.join(timeout=5.0)
+
+        assert not consumer.is_alive()
+        assert results[0]['job_id'] == job_id
+
+        queue.close()
+
+    def test_wake_releases_blocked_dequeue(self, tmp_path):
+        """wake() releases a waiting consumer without a job"""
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+        results = []
+
+        consumer = threading.Thread(target=lambda: results.append(queue.dequeue_blocking(timeout=30.0)))
+        consumer.start()
+        time.sleep(0.05)
+        queue.wake()
+        consumer.join(timeout=5.0)
+
+        assert not consumer.is_alive()
+        assert results == [None]
+
+        queue.close()
+
 
 # ============================================================================
 # Get Job Operation Tests
@@ -1132,6 +1209,25 @@ class TestSQLiteQueueCleanup:
         assert deleted == 5
         queue.close()
 
+    def test_cleanup_deletes_in_batches(self, tmp_path):
+        """cleanup_old_jobs() removes more jobs than fit in a single batch"""
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+        queue.CLEANUP_BATCH_SIZE = 2
+        queue.CLEANUP_CHECKPOINT_EVERY = 1
+
+        old_time = datetime.now(timezone.utc) - timedelta(days=10)
+        for i in range(5):
+            job_id = queue.enqueue()
+            queue.update_status(job_id, JobStatus.COMPLETED, completed_at=old_time)
+        kept_id = queue.enqueue()
+
+        deleted = queue.cleanup_old_jobs(retention_period=7 * 86400)
+
+        assert deleted == 5
+        assert queue.count_jobs() == 1
+        assert queue.get_job(kept_id) is not None
+        queue.close()
+
 
 # ============================================================================
 # Queue Depth Tests
@@ -1307,6 +1403,43 @@ class TestSQLiteQueueHealthCheck:
 
         queue.close()
 
+    def test_snapshot_reports_depth_and_counts(self, tmp_path):
+        """snapshot() returns health, depth and active job counts"""
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+
+        queue.enqueue()
+        queue.enqueue()
+        job_id = queue.enqueue()
+        queue.cancel_job(job_id)
+
+        snapshot = queue.snapshot()
+        assert snapshot['healthy'] is True
+        assert snapshot['depth'] == 2
+        assert snapshot['counts'] == {JobStatus.PENDING: 2, JobStatus.PROCESSING: 0}
+        queue.close()
+
+    def test_snapshot_query_uses_status_index(self, tmp_path):
+        """snapshot() counts through idx_jobs_status instead of scanning jobs"""
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+
+        plan = queue._get_connection().execute(
+            'EXPLAIN QUERY PLAN ' + SNAPSHOT_QUERY, SNAPSHOT_STATUSES
+        ).fetchall()
+
+        assert any('idx_jobs_status' in row[-1] for row in plan)
+        queue.close()
+
+    def test_snapshot_unhealthy_on_database_error(self, tmp_path, mocker):
+        """snapshot() reports unhealthy when the database fails"""
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+        mocker.patch.object(queue, '_get_connection', side_effect=Exception("Database connection failed"))
+
+        snapshot = queue.snapshot()
+        assert snapshot['healthy'] is False
+        assert snapshot['depth'] == 0
+        assert set(snapshot['counts']) == set(SNAPSHOT_STATUSES)
+        queue.close()
+
 
 # ============================================================================
 # Thread Safety Tests
@@ -57,6 +57,12 @@ class TestParseTags:
         """Tags with only whitespace are filtered."""
         assert parse_tags({'tags': '  ,  ,  '}) == []
 
+    def test_returns_independent_lists(self):
+        """Each call returns a fresh list even for the same tags string."""
+        first = parse_tags({'tags': 'movies,hd'})
+        first.append('mutated')
+        assert parse_tags({'tags': 'movies,hd'}) == ['movies', 'hd']
+
 
 # ============================================================================
 # parse_duration()
@@ -125,6 +131,25 @@ class TestParseDuration:
         """Missing number returns 0."""
         assert parse_duration("days") == 0
 
+    def test_abbreviated_unit_rejected(self):
+        """Units must be spelled out - 'd' or 'mo' are not accepted."""
+        assert parse_duration("30 d") == 0
+        assert parse_duration("3 mo") == 0
+
+    def test_minute_and_month_disambiguated(self):
+        """Units sharing an initial resolve to the right multiplier."""
+        assert parse_duration("2 minutes") == 120
+        assert parse_duration("2 months") == 5184000
+
+    def test_memoized(self):
+        """Repeated durations are served from the cache."""
+        parse_duration.cache_clear()
+        parse_duration("45 minutes")
+        parse_duration("45 minutes")
+        info = parse_duration.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
 
 # ============================================================================
 # parse_size()
@@ -352,6 +377,13 @@ class TestIsOlderThan:
         # Should be False because age == duration (not >)
         assert is_older_than(timestamp, "30 days") is False
 
+    @patch('qbt_rules.utils.time.time')
+    def test_explicit_now_skips_clock(self, mock_time):
+        """Passing now uses it instead of reading the clock."""
+        assert is_older_than(1000, "1 minute", now=1000 + 61) is True
+        assert is_newer_than(1000, "1 minute", now=1000 + 59) is True
+        mock_time.assert_not_called()
+
     def test_zero_timestamp(self):
         """Zero timestamp returns False."""
         assert is_older_than(0, "30 days") is False
@@ -472,6 +504,15 @@ class TestFormatBytes:
         """Exact unit boundary formatted correctly."""
         assert format_bytes(1024) == "1.00 KB"
 
+    def test_just_below_boundary(self):
+        """Values just below a unit boundary stay in the smaller unit."""
+        assert format_bytes(1023) == "1023.00 B"
+        assert format_bytes(1048575) == "1024.00 KB"
+
+    def test_beyond_petabytes(self):
+        """Values past the largest unit are expressed in PB."""
+        assert format_bytes(1024 ** 6) == "1024.00 PB"
+
 
 # ============================================================================
 # format_speed()
@@ -13,12 +13,13 @@ Test coverage for:
 
 import pytest
 import time
+import logging
 import threading
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch, call
 
 from qbt_rules.worker import Worker
-from qbt_rules.queue_manager import JobStatus
+from qbt_rules.queue_manager import QueueManager, JobStatus, JobSignal
 
 
 @pytest.fixture
@@ -26,6 +27,10 @@ def mock_queue(mocker):
     """Create mock queue manager"""
     queue = mocker.MagicMock()
     queue.dequeue.return_value = None
+    # Route blocking dequeue/wake through the shared Protocol implementation
+    queue._job_signal = JobSignal()
+    queue.dequeue_blocking.side_effect = lambda timeout: QueueManager.dequeue_blocking(queue, timeout)
+    queue.wake.side_effect = lambda: QueueManager.wake(queue)
     queue.get_queue_depth.return_value = 0
     queue.update_status.return_value = True
     return queue
@@ -354,6 +359,13 @@ class TestWorkerGetStatus:
         assert 'queue_depth' in status
         assert status['queue_depth'] == 5
 
+    def test_get_status_can_skip_queue_depth(self, worker, mock_queue):
+        """Should not query the queue when the caller opts out of the depth"""
+        status = worker.get_status(include_queue_depth=False)
+
+        assert 'queue_depth' not in status
+        mock_queue.get_queue_depth.assert_not_called()
+
     def test_get_status_running_worker(self, worker):
         """Should show running status for started worker"""
         worker.start()
@@ -366,6 +378,16 @@ class TestWorkerGetStatus:
         # Cleanup
         worker.stop()
 
+    def test_get_status_reuses_formatted_completion_time(self, worker):
+        """Should format last_job_completed once when set, not per status call"""
+        worker.last_job_completed = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+        assert worker._last_job_completed_iso == '2024-01-01T12:00:00+00:00'
+        assert worker.get_status()['last_job_completed'] is worker._last_job_completed_iso
+
+        worker.last_job_completed = None
+        assert worker.get_status()['last_job_completed'] is None
+
     def test_get_status_with_last_job_completed(self, worker):
         """Should format last_job_completed as ISO string"""
         completed_time = datetime(2025, 1, 1, 12, 0, 0)
@@ -409,8 +431,30 @@ class TestWorkerRunLoop:
 
         process_spy.assert_called_once_with(job)
 
-    def test_run_loop_sleeps_when_queue_empty(self, worker, mock_queue, mocker):
-        """Should sleep when queue is empty"""
+    def test_run_loop_claims_one_job_at_a_time(self, tmp_path, mock_api, mock_config, mocker):
+        """Jobs not yet started stay pending (cancellable) while another job runs"""
+        from qbt_rules.queue_backends.sqlite_queue import SQLiteQueue
+
+        queue = SQLiteQueue(db_path=str(tmp_path / "test.db"))
+        for _ in range(3):
+            queue.enqueue()
+
+        processing_counts = []
+        worker = Worker(queue, mock_api, mock_config, poll_interval=0.01)
+        mocker.patch.object(
+            worker, '_execute_job',
+            side_effect=lambda context, hash_filter: processing_counts.append(queue.count_jobs(JobStatus.PROCESSING)) or {}
+        )
+
+        worker.start()
+        time.sleep(0.2)
+        worker.stop()
+        queue.close()
+
+        assert processing_counts == [1, 1, 1]
+
+    def test_run_loop_blocks_when_queue_empty(self, worker, mock_queue, mocker):
+        """Should block on the queue instead of sleeping when it is empty"""
         mock_queue.dequeue.return_value = None
 
         sleep_spy = mocker.patch('time.sleep')
@@ -419,23 +463,75 @@ class TestWorkerRunLoop:
         time.sleep(0.05)
         worker.stop()
 
-        # Should have slept with poll_interval
+        mock_queue.dequeue_blocking.assert_called_with(timeout=worker.poll_interval)
         sleep_calls = [c for c in sleep_spy.call_args_list if c[0][0] == worker.poll_interval]
-        assert len(sleep_calls) > 0
+        assert sleep_calls == []
+
+    def test_run_loop_wakes_on_enqueue(self, mock_queue, mock_api, mock_config, mocker):
+        """Should pick up a job as soon as the queue signals, not after poll_interval"""
+        job = {'job_id': 'test-job-1', 'context': 'test', 'hash': None}
+        worker = Worker(mock_queue, mock_api, mock_config, poll_interval=30.0)
+        processed = threading.Event()
+        mocker.patch.object(worker, '_process_job', side_effect=lambda j: processed.set())
 
-    def test_run_loop_handles_dequeue_error(self, worker, mock_queue, mocker):
+        worker.start()
+        time.sleep(0.05)  # Let it block on the empty queue
+        jobs = [job]
+        mock_queue.dequeue.side_effect = lambda: jobs.pop() if jobs else None
+        mock_queue._job_signal.notify()
+
+        assert processed.wait(2.0)
+        worker.stop(timeout=2.0)
+        assert not worker.is_alive()
+
+    def test_stop_wakes_blocked_worker(self, mock_queue, mock_api, mock_config):
+        """stop() should release a worker blocked on an empty queue immediately"""
+        worker = Worker(mock_queue, mock_api, mock_config, poll_interval=30.0)
+
+        worker.start()
+        time.sleep(0.05)
+        start = time.monotonic()
+        worker.stop(timeout=5.0)
+
+        assert not worker.is_alive()
+        assert time.monotonic() - start < 2.0
+
+    def test_run_loop_handles_dequeue_error(self, worker, mock_queue):
         """Should handle and log dequeue errors"""
         mock_queue.dequeue.side_effect = Exception("Queue error")
 
-        sleep_spy = mocker.patch('time.sleep')
-
         worker.start()
         time.sleep(0.1)
+
+        # Should still be running, backing off after the error
+        assert worker.is_alive()
+        assert mock_queue.dequeue.called
         worker.stop()
 
-        # Should still be running and sleeping after error
-        sleep_calls = [c for c in sleep_spy.call_args_list if c[0][0] == worker.poll_interval]
-        assert len(sleep_calls) > 0
+    def test_stop_interrupts_error_backoff(self, mock_queue, mock_api, mock_config):
+        """stop() should not wait out the error backoff"""
+        mock_queue.dequeue.side_effect = Exception("Queue error")
+        worker = Worker(mock_queue, mock_api, mock_config, poll_interval=30.0)
+
+        worker.start()
+        time.sleep(0.05)  # Let it fail and enter the backoff
+        start = time.monotonic()
+        worker.stop(timeout=5.0)
+
+        assert not worker.is_alive()
+        assert time.monotonic() - start < 2.0
+
+    def test_running_reflects_stop_event(self, worker):
+        """running should track the stop event across start and stop"""
+        assert worker._stop_event.is_set()
+
+        worker.start()
+        assert not worker._stop_event.is_set()
+        assert worker.running is True
+
+        worker.stop()
+        assert worker._stop_event.is_set()
+        assert worker.running is False
 
     def test_run_loop_exits_when_running_false(self, worker, mock_queue):
         """Should exit loop when running flag becomes False"""
@@ -519,6 +615,35 @@ class TestWorkerProcessJob:
 
         assert before <= completed_at <= after
 
+    def test_process_job_derives_completed_at_from_monotonic_clock(self, worker, mock_queue, mocker):
+        """completed_at is started_at plus the monotonic execution time"""
+        job = {'job_id': 'job-1', 'context': None, 'hash': None}
+
+        mocker.patch.object(worker, '_execute_job', return_value={})
+        mocker.patch('qbt_rules.worker.time.monotonic', side_effect=[100.0, 102.5])
+
+        worker._process_job(job)
+
+        call_args = mock_queue.update_status.call_args[1]
+        assert call_args['completed_at'] - call_args['started_at'] == timedelta(seconds=2.5)
+        assert worker.last_job_completed == call_args['completed_at']
+
+    def test_process_job_logs_completion_summary(self, worker, mocker, caplog):
+        """Should log the job summary with deferred %-style formatting"""
+        job = {'job_id': 'job-1', 'context': None, 'hash': None}
+        mocker.patch.object(worker, '_execute_job', return_value={
+            'torrents_processed': 4, 'rules_matched': 2, 'actions_executed': 1
+        })
+        mocker.patch('qbt_rules.worker.time.monotonic', side_effect=[10.0, 11.5])
+
+        with caplog.at_level(logging.INFO, logger='qbt_rules.worker'):
+            worker._process_job(job)
+
+        assert (
+            "Job job-1 completed successfully in 1.50s (torrents: 4, rules matched: 2, actions: 1)"
+            in caplog.messages
+        )
+
     def test_process_job_updates_last_job_completed(self, worker, mocker):
         """Should update last_job_completed timestamp"""
         job = {'job_id': 'job-1', 'context': None, 'hash': None}
@@ -548,8 +673,9 @@ class TestWorkerProcessJob:
         assert call_args['status'] == JobStatus.FAILED
 
     def test_process_job_sets_error_on_failure(self, worker, mock_queue, mocker):
-        """Should set error traceback on failure"""
+        """Should set error traceback on failure when tracebacks are stored"""
         job = {'job_id': 'job-1', 'context': None, 'hash': None}
+        worker.config.store_tracebacks.return_value = True
 
         mocker.patch.object(
             worker, '_execute_job',
@@ -565,6 +691,32 @@ class TestWorkerProcessJob:
         assert 'Test error' in error
         assert 'Traceback' in error
 
+    def test_process_job_stores_error_summary_by_default(self, worker, mock_queue, mocker):
+        """Should store only the error summary and skip traceback formatting"""
+        job = {'job_id': 'job-1', 'context': None, 'hash': None}
+        worker.config.store_tracebacks.return_value = False
+        mocker.patch('qbt_rules.worker.logger.isEnabledFor', return_value=False)
+        format_spy = mocker.patch('qbt_rules.worker.traceback.format_exc')
+
+        mocker.patch.object(worker, '_execute_job', side_effect=ValueError("Test error"))
+
+        worker._process_job(job)
+
+        assert mock_queue.update_status.call_args[1]['error'] == 'ValueError: Test error'
+        format_spy.assert_not_called()
+
+    def test_process_job_stores_traceback_at_debug_level(self, worker, mock_queue, mocker):
+        """Should store the full traceback while DEBUG logging is enabled"""
+        job = {'job_id': 'job-1', 'context': None, 'hash': None}
+        worker.config.store_tracebacks.return_value = False
+        mocker.patch('qbt_rules.worker.logger.isEnabledFor', return_value=True)
+
+        mocker.patch.object(worker, '_execute_job', side_effect=ValueError("Test error"))
+
+        worker._process_job(job)
+
+        assert 'Traceback' in mock_queue.update_status.call_args[1]['error']
+
     def test_process_job_does_not_update_last_job_on_failure(self, worker, mocker):
         """Should not update last_job_completed on failure"""
         job = {'job_id': 'job-1', 'context': None, 'hash': None}
@@ -598,6 +750,22 @@ class TestWorkerExecuteJob:
             dry_run=False
         )
 
+    def test_execute_job_uses_engine_factory(self, mock_queue, mock_api, mock_config, mocker):
+        """Should build the engine with an injected factory instead of RulesEngine"""
+        engine_spy = mocker.patch('qbt_rules.worker.RulesEngine')
+        factory = mocker.MagicMock()
+        factory.return_value.stats = mocker.MagicMock(
+            total_torrents=0, processed=0, rules_matched=0,
+            actions_executed=0, actions_skipped=0, errors=0
+        )
+        worker = Worker(mock_queue, mock_api, mock_config, engine_factory=factory)
+
+        worker._execute_job(context=None, hash_filter=None)
+
+        factory.assert_called_once_with(api=mock_api, config=mock_config, dry_run=False)
+        factory.return_value.run.assert_called_once_with(context=None, torrent_hash=None)
+        engine_spy.assert_not_called()
+
     def test_execute_job_uses_dry_run_from_config(self, worker, mocker):
         """Should get dry_run setting from config"""
         worker.config.is_dry_run.return_value = True
@@ -680,6 +848,30 @@ class TestWorkerExecuteJob:
         with pytest.raises(ValueError, match="Engine error"):
             worker._execute_job(context=None, hash_filter=None)
 
+    def test_execute_job_reuses_engine_across_jobs(self, worker, mocker):
+        """Should build the engine once and reset its stats before each job"""
+        engine_mock = mocker.MagicMock()
+        engine_spy = mocker.patch('qbt_rules.worker.RulesEngine', return_value=engine_mock)
+
+        worker._execute_job(context='first', hash_filter=None)
+        worker._execute_job(context='second', hash_filter=None)
+
+        engine_spy.assert_called_once()
+        assert engine_mock.reset_stats.call_count == 2
+        assert engine_mock.run.call_count == 2
+
+    def test_execute_job_rereads_dry_run_per_job(self, worker, mocker):
+        """A dry-run change applies to the next job on the reused engine"""
+        engine_mock = mocker.MagicMock()
+        mocker.patch('qbt_rules.worker.RulesEngine', return_value=engine_mock)
+
+        worker.config.is_dry_run.return_value = False
+        assert worker._execute_job(context=None, hash_filter=None)['dry_run'] is False
+
+        worker.config.is_dry_run.return_value = True
+        assert worker._execute_job(context=None, hash_filter=None)['dry_run'] is True
+        engine_mock.set_dry_run.assert_called_with(True)
+
 
 class TestWorkerRepr:
     """Test worker.__repr__() method"""